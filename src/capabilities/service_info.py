@@ -35,20 +35,7 @@ def get_service_info(
         JSON with requested service information
     """
     try:
-        cfg = get_config()
-
-        if info_type == "pricing":
-            result = _get_pricing_info()
-        elif info_type == "capabilities":
-            result = _get_capabilities_info()
-        elif info_type == "profile":
-            result = _get_profile_info(cfg, ctx)
-        elif info_type == "status":
-            result = _get_status_info(cfg)
-        else:  # overview
-            result = _get_overview_info(cfg)
-
-        return json.dumps(result, indent=2)
+        return json.dumps(_build_service_info(info_type, ctx), indent=2)
 
     except Exception as e:
         logger.error(f"Failed to get service info: {e}")
@@ -59,6 +46,22 @@ def get_service_info(
         }, indent=2)
 
 
+def _build_service_info(info_type: str = "overview", ctx: Optional[Context] = None) -> dict:
+    """Build the service info payload for info_type, before serialization."""
+    cfg = get_config()
+
+    if info_type == "pricing":
+        return _get_pricing_info()
+    elif info_type == "capabilities":
+        return _get_capabilities_info()
+    elif info_type == "profile":
+        return _get_profile_info(cfg, ctx)
+    elif info_type == "status":
+        return _get_status_info(cfg)
+    else:  # overview
+        return _get_overview_info(cfg)
+
+
 def _get_overview_info(cfg) -> dict:
     """Get overview information about Profitelligence."""
     return {
@@ -3,13 +3,20 @@ Profitelligence MCP Server.
 
 FastMCP server providing access to Profitelligence financial data APIs.
 """
+import json
 import logging
-from typing import Optional
+from typing import Any, Optional
 from fastmcp import FastMCP, Context
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib encoder is used without it
+    orjson = None
+
 from .capabilities import service_info
 from .tools import mcp_tools
-from .utils.config import get_config
+from .utils.api_client import close_pooled_clients
+from .utils.config import get_config, reset_config
 from .utils.oauth import get_oauth_metadata, should_use_oauth
 
 # Configure logging
@@ -23,6 +30,17 @@ logger = logging.getLogger(__name__)
 mcp = FastMCP("Profitelligence")
 
 
+def _to_json(data: Any) -> str:
+    """Serialize a tool result to a JSON string, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # e.g. integers wider than 64 bits; let the stdlib encoder handle them
+            pass
+    return json.dumps(data)
+
+
 # ============================================================================
 # V3 TOOLS - Clean, LLM-friendly (maps to /mcp-* endpoints)
 # ============================================================================
@@ -38,8 +56,7 @@ def pulse(ctx: Context) -> str:
     Example: pulse()
     """
     logger.info("Tool invoked: pulse()")
-    import json
-    return json.dumps(mcp_tools.pulse(ctx))
+    return _to_json(mcp_tools.pulse(ctx))
 
 
 @mcp.tool()
@@ -68,8 +85,7 @@ def investigate(
         investigate("Technology", entity_type="sector")
     """
     logger.info(f"Tool invoked: investigate(subject={subject}, days={days})")
-    import json
-    return json.dumps(mcp_tools.investigate(subject, entity_type, days, ctx))
+    return _to_json(mcp_tools.investigate(subject, entity_type, days, ctx))
 
 
 @mcp.tool()
@@ -96,8 +112,7 @@ def screen(
         screen(focus="insider", sector="Technology")
     """
     logger.info(f"Tool invoked: screen(focus={focus}, sector={sector})")
-    import json
-    return json.dumps(mcp_tools.screen(focus, sector, min_score, days, limit, ctx))
+    return _to_json(mcp_tools.screen(focus, sector, min_score, days, limit, ctx))
 
 
 @mcp.tool()
@@ -120,8 +135,7 @@ def assess(
         assess("AAPL", days=90)
     """
     logger.info(f"Tool invoked: assess(symbol={symbol}, days={days})")
-    import json
-    return json.dumps(mcp_tools.assess(symbol, days, ctx))
+    return _to_json(mcp_tools.assess(symbol, days, ctx))
 
 
 @mcp.tool()
@@ -153,8 +167,7 @@ def institutional(
         institutional("signal")  # Overview of all signals
     """
     logger.info(f"Tool invoked: institutional(query_type={query_type}, identifier={identifier}, signal_type={signal_type})")
-    import json
-    return json.dumps(mcp_tools.institutional(query_type, identifier, signal_type, limit, ctx))
+    return _to_json(mcp_tools.institutional(query_type, identifier, signal_type, limit, ctx))
 
 
 @mcp.tool()
@@ -187,8 +200,7 @@ def search(
         search("acquisition", sector="Technology", impact="HIGH")  # High-impact M&A
     """
     logger.info(f"Tool invoked: search(q={q}, entity_type={entity_type}, sector={sector}, impact={impact})")
-    import json
-    return json.dumps(mcp_tools.search(q, entity_type, sector, impact, limit, ctx))
+    return _to_json(mcp_tools.search(q, entity_type, sector, impact, limit, ctx))
 
 
 @mcp.tool()
@@ -987,7 +999,6 @@ async def oauth_register(request):
     the configured client_id since we're using Google OAuth (pre-registered).
     """
     from starlette.responses import JSONResponse
-    import json
 
     # Handle CORS preflight
     if request.method == "OPTIONS":
@@ -1640,9 +1651,7 @@ def main():
 
                         # Re-load config to trigger the model_validator that reads from the JSON file
                         logger.info("Re-loading config to parse OAuth credentials from file...")
-                        from .utils.config import load_config
-                        global config
-                        config = None  # Clear cached config
+                        reset_config()
                         cfg = get_config()  # Reload with file now present
                         logger.info(f"  ✓ OAuth client_id loaded: {cfg.oauth_client_id[:40] if cfg.oauth_client_id else 'NOT LOADED'}...")
                         logger.info(f"  ✓ OAuth client_secret loaded: {'YES' if cfg.oauth_client_secret else 'NO'}")
@@ -1748,6 +1757,10 @@ def main():
         print(f"ERROR: {str(e)}")
         exit(1)
 
+    finally:
+        # Release the shared API connection pools once the server stops
+        close_pooled_clients()
+
 
 if __name__ == "__main__":
     main()
@@ -4,11 +4,35 @@ HTTP client for Profitelligence API.
 Handles authentication, retries, and error handling.
 """
 import httpx
+import threading
+from http.cookiejar import CookieJar, DefaultCookiePolicy
 from typing import Any, Dict, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+USER_AGENT = "Profitelligence-MCP/0.1.0"
+
+# Shared httpx clients keyed by base URL. Per-request APIClients borrow these so
+# every tool call reuses one connection pool instead of a fresh TCP/TLS handshake;
+# credentials travel as per-request headers, never as client defaults.
+_pooled_clients: Dict[str, httpx.Client] = {}
+_pool_lock = threading.Lock()
+
+
+class _RejectAllCookiesPolicy(DefaultCookiePolicy):
+    """Cookie policy that never stores or sends cookies.
+
+    Pooled clients are shared between users, so a Set-Cookie from one user's
+    response must never ride along on another user's request.
+    """
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
 
 class ProfitelligenceAPIError(Exception):
     """Base exception for API errors."""
@@ -19,6 +43,39 @@ class ProfitelligenceAPIError(Exception):
         super().__init__(self.message)
 
 
+def _new_httpx_client(base_url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Client:
+    """Create an httpx client with the API's default timeout, redirects and User-Agent."""
+    return httpx.Client(
+        base_url=base_url,
+        timeout=30.0,
+        follow_redirects=True,
+        headers={"User-Agent": USER_AGENT, **(headers or {})}
+    )
+
+
+def _get_pooled_httpx_client(base_url: str) -> httpx.Client:
+    """Return the shared httpx client for base_url, creating it on first use."""
+    client = _pooled_clients.get(base_url)
+    if client is None or client.is_closed:
+        with _pool_lock:
+            client = _pooled_clients.get(base_url)
+            if client is None or client.is_closed:
+                client = _new_httpx_client(base_url)
+                client.cookies = CookieJar(policy=_RejectAllCookiesPolicy())
+                _pooled_clients[base_url] = client
+                logger.debug(f"Opened pooled HTTP client for {base_url}")
+    return client
+
+
+def close_pooled_clients() -> None:
+    """Close and forget every shared httpx client (e.g. on shutdown)."""
+    with _pool_lock:
+        clients = list(_pooled_clients.values())
+        _pooled_clients.clear()
+    for client in clients:
+        client.close()
+
+
 class APIClient:
     """HTTP client for Profitelligence API."""
 
@@ -28,7 +85,8 @@ class APIClient:
         firebase_token: str = None,
         oauth_token: str = None,
         auth_method: str = 'api_key',
-        base_url: str = "https://apollo.profitelligence.com"
+        base_url: str = "https://apollo.profitelligence.com",
+        pooled: bool = False
     ):
         """
         Initialize API client with credentials.
@@ -39,6 +97,8 @@ class APIClient:
             oauth_token: OAuth Bearer token (for oauth auth)
             auth_method: Authentication method ('api_key', 'oauth', or 'firebase_jwt')
             base_url: Base URL for API (default: apollo.profitelligence.com)
+            pooled: Borrow the shared connection pool for base_url instead of
+                opening a dedicated one; close() then leaves it open
         """
         # Validate authentication method
         if auth_method not in ('api_key', 'oauth', 'firebase_jwt'):
@@ -48,7 +108,7 @@ class APIClient:
         if auth_method == 'api_key':
             if not api_key:
                 raise ValueError("API key is required for api_key authentication")
-            if not (api_key.startswith('pk_live_') or api_key.startswith('pk_test_')):
+            if not api_key.startswith(('pk_live_', 'pk_test_')):
                 raise ValueError("API key must start with 'pk_live_' or 'pk_test_'")
             auth_header = f"ApiKey {api_key}"
             self.api_key = api_key
@@ -71,20 +131,28 @@ class APIClient:
         self.base_url = base_url.rstrip('/')
         self.auth_method = auth_method
         self.firebase_token = firebase_token
+        self.pooled = pooled
+        self._auth_headers = {"Authorization": auth_header}
 
-        # Create httpx client with sensible defaults
-        self.client = httpx.Client(
-            base_url=self.base_url,
-            timeout=30.0,
-            follow_redirects=True,
-            headers={
-                "Authorization": auth_header,
-                "User-Agent": "Profitelligence-MCP/0.1.0",
-            }
-        )
+        if pooled:
+            self.client = _get_pooled_httpx_client(self.base_url)
+        else:
+            self.client = self._build_httpx_client(auth_header)
 
         logger.debug(f"API client initialized for {self.base_url} using {auth_method}")
 
+    def _build_httpx_client(self, auth_header: str) -> httpx.Client:
+        """
+        Create the underlying httpx client with sensible defaults.
+
+        Args:
+            auth_header: Value for the Authorization header
+
+        Returns:
+            Configured httpx.Client
+        """
+        return _new_httpx_client(self.base_url, {"Authorization": auth_header})
+
     def _parse_response(self, response: httpx.Response) -> Any:
         """
         Parse API response and handle errors.
@@ -147,7 +215,7 @@ class APIClient:
         """
         try:
             logger.debug(f"GET {path} with params: {params}")
-            response = self.client.get(path, params=params)
+            response = self.client.get(path, params=params, headers=self._auth_headers)
             return self._parse_response(response)
 
         except httpx.HTTPError as e:
@@ -170,7 +238,7 @@ class APIClient:
         """
         try:
             logger.debug(f"POST {path} with body: {json}")
-            response = self.client.post(path, json=json)
+            response = self.client.post(path, json=json, headers=self._auth_headers)
             return self._parse_response(response)
 
         except httpx.HTTPError as e:
@@ -178,8 +246,9 @@ class APIClient:
             raise ProfitelligenceAPIError(f"HTTP error: {str(e)}")
 
     def close(self):
-        """Close HTTP client."""
-        self.client.close()
+        """Close HTTP client. Pooled clients are shared, so they stay open."""
+        if not self.pooled:
+            self.client.close()
 
     def __enter__(self):
         """Context manager entry."""
@@ -195,7 +264,8 @@ def create_client(
     firebase_token: str = None,
     oauth_token: str = None,
     auth_method: str = 'api_key',
-    base_url: str = "https://apollo.profitelligence.com"
+    base_url: str = "https://apollo.profitelligence.com",
+    pooled: bool = False
 ) -> APIClient:
     """
     Create a new API client instance for a specific user.
@@ -206,6 +276,7 @@ def create_client(
         oauth_token: OAuth Bearer token (for oauth auth)
         auth_method: Authentication method ('api_key', 'oauth', or 'firebase_jwt')
         base_url: API base URL (default: apollo.profitelligence.com)
+        pooled: Reuse the shared connection pool for base_url
 
     Returns:
         Configured APIClient instance
@@ -218,7 +289,8 @@ def create_client(
         firebase_token=firebase_token,
         oauth_token=oauth_token,
         auth_method=auth_method,
-        base_url=base_url
+        base_url=base_url,
+        pooled=pooled
     )
 
 
@@ -227,7 +299,8 @@ def create_client_from_config(config, ctx=None) -> APIClient:
     Create API client using configuration and optional context.
 
     This is a convenience function that handles all authentication methods
-    automatically based on the config.
+    automatically based on the config. Clients are built per request, so they
+    share the pooled connection for config.api_base_url.
 
     Args:
         config: Config object with auth settings
@@ -248,7 +321,8 @@ def create_client_from_config(config, ctx=None) -> APIClient:
         return create_client(
             api_key=api_key,
             auth_method='api_key',
-            base_url=config.api_base_url
+            base_url=config.api_base_url,
+            pooled=True
         )
 
     elif config.auth_method == 'oauth':
@@ -266,7 +340,8 @@ def create_client_from_config(config, ctx=None) -> APIClient:
         return create_client(
             firebase_token=oauth_token,
             auth_method='firebase_jwt',
-            base_url=config.api_base_url
+            base_url=config.api_base_url,
+            pooled=True
         )
 
     else:  # firebase_jwt
@@ -285,5 +360,6 @@ def create_client_from_config(config, ctx=None) -> APIClient:
         return create_client(
             firebase_token=firebase_token,
             auth_method='firebase_jwt',
-            base_url=config.api_base_url
+            base_url=config.api_base_url,
+            pooled=True
         )
@@ -9,24 +9,90 @@ from typing import Optional, Tuple
 from fastmcp import Context
 from .config import get_config
 
+try:
+    from fastmcp.server.dependencies import get_http_request as _fastmcp_get_http_request
+except ImportError:  # Older FastMCP without HTTP request dependencies
+    _fastmcp_get_http_request = None
+
 logger = logging.getLogger(__name__)
 
+# Authorization schemes understood by _parse_authorization (lowercase)
+_AUTH_SCHEMES = frozenset({"bearer", "apikey"})
+
 
 def _get_http_request():
     """
     Get HTTP request from FastMCP's request context.
 
     FastMCP provides get_http_request() as a standalone dependency function,
-    NOT a method on the Context object.
+    NOT a method on the Context object. It is resolved once at import time.
     """
+    if _fastmcp_get_http_request is None:
+        return None
     try:
-        from fastmcp.server.dependencies import get_http_request
-        return get_http_request()
+        return _fastmcp_get_http_request()
     except Exception as e:
         logger.debug(f"Could not get HTTP request: {e}")
         return None
 
 
+def _parse_authorization(auth_header: str) -> Tuple[Optional[str], str]:
+    """
+    Split an Authorization header value into (scheme, credential).
+
+    Schemes are matched case-insensitively (RFC 7235). The scheme is returned
+    lowercased ('bearer' or 'apikey'), or None with the raw value when the
+    header has no recognized scheme.
+    """
+    # Fast path: canonical capitalization needs no lowercased copy
+    if auth_header.startswith("Bearer "):
+        return 'bearer', auth_header[7:].strip()
+
+    scheme, _, credential = auth_header.lstrip().partition(" ")
+    scheme = scheme.lower()
+    if scheme in _AUTH_SCHEMES:
+        return scheme, credential.strip()
+    return None, auth_header
+
+
+def _extract(http_req) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Pull every supported credential out of an HTTP request in a single pass.
+
+    The API key follows get_api_key_from_context's priority order:
+    query params (apiKey, api_key), x-api-key header, then the Authorization
+    header (ApiKey, Bearer, or raw value). The bearer token is only set for an
+    Authorization: Bearer header.
+
+    Args:
+        http_req: Starlette request, or None outside an HTTP request
+
+    Returns:
+        Tuple of (api_key, bearer_token); either may be None
+    """
+    if not http_req:
+        return None, None
+
+    query_params = getattr(http_req, 'query_params', None) or {}
+    # Lowercase header names in one pass so each probe below is a plain dict lookup.
+    # Keep the first value of a repeated header, as Starlette's headers.get() does.
+    headers = {}
+    for name, value in getattr(http_req, 'headers', {}).items():
+        headers.setdefault(name.lower(), value)
+
+    auth_header = headers.get("authorization")
+    scheme, credential = _parse_authorization(auth_header) if auth_header else (None, None)
+    bearer = credential if scheme == 'bearer' else None
+
+    api_key = (
+        query_params.get("apiKey") or
+        query_params.get("api_key") or
+        headers.get("x-api-key") or
+        credential
+    )
+    return api_key or None, bearer or None
+
+
 def get_credentials_from_context(ctx: Optional[Context] = None) -> Tuple[str, str]:
     """
     Extract credentials from FastMCP context based on configured auth method.
@@ -48,58 +114,48 @@ def get_credentials_from_context(ctx: Optional[Context] = None) -> Tuple[str, st
     """
     cfg = get_config()
 
+    # API key mode - extract API key
+    if cfg.auth_method == 'api_key':
+        api_key = get_api_key_from_context(ctx)
+        return ('api_key', api_key)
+
+    # Every other mode looks at the request once and picks what it needs
+    api_key, bearer = _extract(_get_http_request())
+
     # Both mode - auto-detect based on what's provided
     if cfg.auth_method == 'both':
-        http_req = _get_http_request()
-        if http_req:
-            auth_header = getattr(http_req, 'headers', {}).get("authorization")
-            # If Bearer token present, use OAuth
-            if auth_header and auth_header.startswith("Bearer "):
-                token = auth_header[7:]
-                logger.debug("Auto-detected OAuth Bearer token")
-                return ('oauth', token)
+        # If Bearer token present, use OAuth
+        if bearer:
+            logger.debug("Auto-detected OAuth Bearer token")
+            return ('oauth', bearer)
 
         # Otherwise try API key
-        try:
-            api_key = get_api_key_from_context(ctx)
+        if api_key:
             logger.debug("Auto-detected API key authentication")
             return ('api_key', api_key)
-        except ValueError:
-            raise ValueError(
-                "No credentials provided. Provide either:\n"
-                "- Authorization: Bearer <token> for OAuth\n"
-                "- X-API-Key header or apiKey query param for API key"
-            )
+
+        raise ValueError(
+            "No credentials provided. Provide either:\n"
+            "- Authorization: Bearer <token> for OAuth\n"
+            "- X-API-Key header or apiKey query param for API key"
+        )
 
     # OAuth mode - extract Bearer token
     elif cfg.auth_method == 'oauth':
-        http_req = _get_http_request()
-        if http_req:
-            auth_header = getattr(http_req, 'headers', {}).get("authorization")
-            if auth_header and auth_header.startswith("Bearer "):
-                token = auth_header[7:]  # Remove "Bearer " prefix
-                logger.debug("OAuth Bearer token found in Authorization header")
-                return ('oauth', token)
+        if bearer:
+            logger.debug("OAuth Bearer token found in Authorization header")
+            return ('oauth', bearer)
 
         raise ValueError(
             "No OAuth token provided. "
             "OAuth mode requires Authorization: Bearer <token> header."
         )
 
-    # API key mode - extract API key
-    elif cfg.auth_method == 'api_key':
-        api_key = get_api_key_from_context(ctx)
-        return ('api_key', api_key)
-
     # Firebase JWT mode - extract Firebase token
     else:  # firebase_jwt
-        http_req = _get_http_request()
-        if http_req:
-            auth_header = getattr(http_req, 'headers', {}).get("authorization")
-            if auth_header and auth_header.startswith("Bearer "):
-                token = auth_header[7:]
-                logger.debug("Firebase JWT found in Authorization header")
-                return ('firebase_jwt', token)
+        if bearer:
+            logger.debug("Firebase JWT found in Authorization header")
+            return ('firebase_jwt', bearer)
 
         # Fall back to config
         if cfg.firebase_id_token:
@@ -131,38 +187,9 @@ def get_api_key_from_context(ctx: Optional[Context] = None) -> str:
     Raises:
         ValueError: If no API key is found in any source
     """
-    # Try to extract from HTTP request context
-    http_req = _get_http_request()
-    if http_req:
-        # 1. Check query parameters
-        query_params = getattr(http_req, 'query_params', {})
-        if query_params:
-            api_key_from_query = (
-                query_params.get("apiKey") or
-                query_params.get("api_key")
-            )
-            if api_key_from_query:
-                logger.debug("API key found in query parameters")
-                return api_key_from_query
-
-        # 2. Check x-api-key header
-        headers = getattr(http_req, 'headers', {})
-        api_key = headers.get("x-api-key")
-        if api_key:
-            logger.debug("API key found in x-api-key header")
-            return api_key
-
-        # 3. Check Authorization header
-        auth_header = headers.get("authorization")
-        if auth_header:
-            if auth_header.startswith("ApiKey "):
-                logger.debug("API key found in Authorization header (ApiKey)")
-                return auth_header[7:]
-            elif auth_header.startswith("Bearer "):
-                logger.debug("API key found in Authorization header (Bearer)")
-                return auth_header[7:]
-            else:
-                logger.debug("API key found in Authorization header (raw)")
-                return auth_header
+    api_key, _ = _extract(_get_http_request())
+    if api_key:
+        logger.debug("API key found in HTTP request")
+        return api_key
 
     raise ValueError("No API key provided. Set X-API-Key header or apiKey query parameter.")
@@ -4,13 +4,21 @@ Configuration management for Profitelligence MCP Server.
 Loads settings from environment variables with validation.
 """
 import os
-from typing import Optional
-from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field, field_validator, model_validator, ValidationInfo
+import sys
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field, field_validator, model_validator, ValidationInfo
 
+# Environment variables read by load_config() (matched case-insensitively)
+ENV_PREFIX = "PROF_"
 
-class Config(BaseSettings):
-    """MCP Server configuration."""
+# Accepted values for the enumerated settings
+_AUTH_METHODS = frozenset({"api_key", "oauth", "both", "firebase_jwt"})
+_MCP_MODES = frozenset({"stdio", "http"})
+
+
+class Config(BaseModel):
+    """MCP Server configuration, populated from PROF_* environment variables by load_config()."""
 
     # Authentication Configuration
     auth_method: str = Field(
@@ -84,7 +92,7 @@ class Config(BaseSettings):
     # Firebase Web API Key (for client-side auth operations)
     # Accepts PROF_FIREBASE_WEB_API_KEY or FIREBASE_WEB_API_KEY (for backward compatibility)
     firebase_web_api_key: Optional[str] = Field(
-        default_factory=lambda: os.environ.get('PROF_FIREBASE_WEB_API_KEY') or os.environ.get('FIREBASE_WEB_API_KEY'),
+        default=None,
         description="Firebase Web API key for signInWithIdp endpoint"
     )
 
@@ -197,9 +205,10 @@ class Config(BaseSettings):
     @classmethod
     def validate_auth_method(cls, v: str) -> str:
         """Ensure auth method is valid."""
-        if v not in ('api_key', 'oauth', 'both', 'firebase_jwt'):
+        if v not in _AUTH_METHODS:
             raise ValueError("auth_method must be 'api_key', 'oauth', 'both', or 'firebase_jwt'")
-        return v
+        # Interned so comparisons against the literal method names hit the identity fast path
+        return sys.intern(v)
 
     @field_validator('api_key')
     @classmethod
@@ -208,7 +217,7 @@ class Config(BaseSettings):
         # API key is OPTIONAL in config for multitenancy
         # Users can provide API keys per-request via headers/query params
         # Only validate format if provided
-        if v and not (v.startswith('pk_live_') or v.startswith('pk_test_')):
+        if v and not v.startswith(('pk_live_', 'pk_test_')):
             raise ValueError("API key must start with 'pk_live_' or 'pk_test_'")
 
         return v
@@ -217,19 +226,19 @@ class Config(BaseSettings):
     @classmethod
     def validate_base_url(cls, v: str) -> str:
         """Ensure base URL is valid."""
-        if not v.startswith('http://') and not v.startswith('https://'):
+        if not v.startswith(('http://', 'https://')):
             raise ValueError("Base URL must start with http:// or https://")
 
-        # Remove trailing slash
+        # Remove trailing slashes (rstrip, not removesuffix, so "//" is normalized too)
         return v.rstrip('/')
 
     @field_validator('mcp_mode')
     @classmethod
     def validate_mode(cls, v: str) -> str:
         """Ensure mode is valid."""
-        if v not in ('stdio', 'http'):
+        if v not in _MCP_MODES:
             raise ValueError("Mode must be 'stdio' or 'http'")
-        return v
+        return sys.intern(v)
 
     @model_validator(mode='after')
     def set_oauth_enabled_and_validate_firebase(self):
@@ -248,10 +257,26 @@ class Config(BaseSettings):
 
         return self
 
-    model_config = SettingsConfigDict(
-        env_prefix="PROF_",
-        case_sensitive=False,
-    )
+
+def _env_snapshot() -> Dict[str, Any]:
+    """
+    Read the environment once and map it to Config field names.
+
+    PROF_* variables have the prefix stripped and are lowercased. The only
+    unprefixed variable, FIREBASE_WEB_API_KEY, is picked up from the same pass.
+    """
+    prefix_len = len(ENV_PREFIX)
+    env: Dict[str, Any] = {}
+    legacy_web_api_key = None
+    for name, value in os.environ.items():
+        if name[:prefix_len].upper() == ENV_PREFIX:
+            env[name[prefix_len:].lower()] = value
+        elif name == 'FIREBASE_WEB_API_KEY':
+            legacy_web_api_key = value
+
+    if not env.get('firebase_web_api_key') and legacy_web_api_key:
+        env['firebase_web_api_key'] = legacy_web_api_key
+    return env
 
 
 def load_config() -> Config:
@@ -285,18 +310,22 @@ def load_config() -> Config:
         ValueError: If required config is missing or invalid
     """
     try:
-        return Config()
+        return Config.model_validate(_env_snapshot())
     except Exception as e:
         raise ValueError(f"Configuration error: {str(e)}")
 
 
-# Global config instance
-config: Optional[Config] = None
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """
+    Get or initialize the global config instance.
+
+    The config is loaded once and cached; call reset_config() to reload it
+    from the environment.
+    """
+    return load_config()
 
 
-def get_config() -> Config:
-    """Get or initialize global config instance."""
-    global config
-    if config is None:
-        config = load_config()
-    return config
+def reset_config() -> None:
+    """Drop the cached config so the next get_config() call reloads it."""
+    get_config.cache_clear()
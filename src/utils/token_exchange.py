@@ -5,20 +5,143 @@ Exchanges Google OAuth tokens for Firebase custom tokens, preserving user identi
 This allows the MCP server to be OAuth 2.1 compliant while maintaining Firebase-based
 user identity in the backend.
 """
+import hashlib
+import json
 import logging
-import firebase_admin
-from firebase_admin import credentials, auth
-from typing import Optional, Dict, Any
+import threading
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple
 from .config import get_config
 from .google_oauth import validate_google_oauth_token
 
+if TYPE_CHECKING:
+    import firebase_admin
+    from firebase_admin import credentials
+
 logger = logging.getLogger(__name__)
 
 # Global Firebase app instance
-_firebase_app: Optional[firebase_admin.App] = None
+_firebase_app: Optional["firebase_admin.App"] = None
+
+# Guards Firebase initialization so concurrent requests only load credentials once
+_firebase_init_lock = threading.Lock()
+
+# In-memory cache of validated Google token claims (raw tokens are never stored)
+# Format: {(token_digest, audience): {"value": claims, "expires_at": float}}
+_google_claims_cache: Dict[Tuple[bytes, str], Dict[str, Any]] = {}
+
+# Maximum time validated Google claims are reused (5 minutes)
+GOOGLE_CLAIMS_TTL = 300
+
+# In-memory cache of Firebase UID lookups (a None value records a known-missing user)
+# Format: {normalized_email: {"value": uid_or_None, "expires_at": float}}
+_firebase_uid_cache: Dict[str, Dict[str, Any]] = {}
+
+# How long Firebase UID lookups are reused (found: 10 minutes, not found: 1 minute)
+FIREBASE_UID_TTL = 600
+FIREBASE_UID_NOT_FOUND_TTL = 60
+
+# Firebase Auth get_users() accepts at most 100 identifiers per call
+FIREBASE_GET_USERS_BATCH_SIZE = 100
+
+# Upper bound on entries held by each in-memory cache
+CACHE_MAX_ENTRIES = 10_000
+
+# Returned by _cache_get() when a key is absent, since None can be a cached value
+_NOT_CACHED = object()
+
+# Guards the in-memory caches, which are read and evicted from concurrent request threads
+_cache_lock = threading.Lock()
+
+
+def _token_digest(token: str) -> bytes:
+    """Hash a bearer token into a compact cache key so the raw token is never kept."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _email_key(email: str) -> str:
+    """Normalize an email for cache lookups; Firebase treats emails case-insensitively."""
+    return email.strip().lower()
+
+
+def _cache_get(cache: Dict[Any, Dict[str, Any]], key: Any, default: Any = None) -> Any:
+    """Return a cached value, or `default` if missing or expired."""
+    with _cache_lock:
+        entry = cache.get(key)
+        if entry is None:
+            return default
+
+        if entry["expires_at"] <= time.time():
+            cache.pop(key, None)
+            return default
+
+        return entry["value"]
+
+
+def _cache_set(cache: Dict[Any, Dict[str, Any]], key: Any, value: Any, ttl: float) -> None:
+    """Store a value with a TTL, evicting expired (then oldest) entries when full."""
+    if ttl <= 0:
+        return
+
+    current_time = time.time()
+    with _cache_lock:
+        if len(cache) >= CACHE_MAX_ENTRIES:
+            expired_keys = [k for k, entry in cache.items() if entry["expires_at"] <= current_time]
+            for k in expired_keys:
+                del cache[k]
+            while len(cache) >= CACHE_MAX_ENTRIES:
+                del cache[next(iter(cache))]
 
+        cache[key] = {"value": value, "expires_at": current_time + ttl}
 
-def initialize_firebase() -> firebase_admin.App:
+
+def _validate_google_token_cached(google_token: str, expected_audience: str) -> Dict[str, Any]:
+    """
+    Validate a Google OAuth token, reusing claims from a recent validation.
+
+    Signature verification is skipped for a token that was already validated,
+    for at most GOOGLE_CLAIMS_TTL seconds and never past the token's own 'exp'.
+
+    Args:
+        google_token: Google OAuth access token
+        expected_audience: Expected audience for token validation
+
+    Returns:
+        Decoded token claims
+
+    Raises:
+        ValueError: If token is invalid
+    """
+    key = (_token_digest(google_token), expected_audience)
+    claims = _cache_get(_google_claims_cache, key)
+    if claims is not None:
+        logger.debug("Using cached Google token claims")
+        return claims
+
+    claims = validate_google_oauth_token(google_token, expected_audience)
+    ttl = min(GOOGLE_CLAIMS_TTL, claims.get("exp", 0) - time.time())
+    _cache_set(_google_claims_cache, key, claims, ttl)
+    return claims
+
+
+@lru_cache(maxsize=1)
+def _fb() -> Tuple[Any, Any, Any]:
+    """
+    Import the Firebase Admin SDK on first use.
+
+    firebase_admin pulls in google.auth, gRPC and cryptography, so importing it
+    lazily keeps it off the server's startup path (API key users never need it).
+
+    Returns:
+        Tuple of (firebase_admin, firebase_admin.credentials, firebase_admin.auth)
+    """
+    import firebase_admin
+    from firebase_admin import credentials, auth
+    return firebase_admin, credentials, auth
+
+
+def initialize_firebase() -> "firebase_admin.App":
     """
     Initialize Firebase Admin SDK.
 
@@ -31,12 +154,45 @@ def initialize_firebase() -> firebase_admin.App:
     Raises:
         ValueError: If Firebase configuration is missing or invalid
     """
-    global _firebase_app
-
     if _firebase_app is not None:
-        logger.debug("Firebase Admin SDK already initialized")
         return _firebase_app
 
+    with _firebase_init_lock:
+        # Another thread may have finished initialization while we waited
+        if _firebase_app is not None:
+            logger.debug("Firebase Admin SDK already initialized")
+            return _firebase_app
+
+        return _initialize_firebase_locked()
+
+
+@lru_cache(maxsize=1)
+def _load_firebase_credentials(
+    key_path: Optional[str],
+    service_account_json: Optional[str]
+) -> "credentials.Certificate":
+    """
+    Parse service account credentials, caching the result per configuration.
+
+    Building a Certificate parses the JSON and loads the RSA private key, so the
+    parsed object is reused as long as the configured credentials are unchanged.
+    """
+    _, credentials, _ = _fb()
+
+    # Initialize with service account key file
+    if key_path:
+        logger.info(f"Loading Firebase credentials from: {key_path}")
+        return credentials.Certificate(key_path)
+
+    # Or initialize with inline JSON
+    logger.info("Loading Firebase credentials from environment variable")
+    return credentials.Certificate(json.loads(service_account_json))
+
+
+def _initialize_firebase_locked() -> "firebase_admin.App":
+    """Load credentials and initialize the Firebase app. Caller must hold _firebase_init_lock."""
+    global _firebase_app
+
     cfg = get_config()
 
     # Check for service account configuration
@@ -48,17 +204,11 @@ def initialize_firebase() -> firebase_admin.App:
         )
 
     try:
-        # Initialize with service account key file
-        if cfg.firebase_service_account_key_path:
-            cred = credentials.Certificate(cfg.firebase_service_account_key_path)
-            logger.info(f"Loading Firebase credentials from: {cfg.firebase_service_account_key_path}")
-        # Or initialize with inline JSON
-        elif cfg.firebase_service_account_json:
-            import json
-            cred_dict = json.loads(cfg.firebase_service_account_json)
-            cred = credentials.Certificate(cred_dict)
-            logger.info("Loading Firebase credentials from environment variable")
-
+        cred = _load_firebase_credentials(
+            cfg.firebase_service_account_key_path,
+            cfg.firebase_service_account_json
+        )
+        firebase_admin, _, _ = _fb()
         _firebase_app = firebase_admin.initialize_app(cred)
         logger.info("Firebase Admin SDK initialized successfully")
         return _firebase_app
@@ -68,6 +218,73 @@ def initialize_firebase() -> firebase_admin.App:
         raise ValueError(f"Firebase initialization failed: {str(e)}")
 
 
+def lookup_firebase_uids_by_emails(emails: List[str]) -> Dict[str, Optional[str]]:
+    """
+    Look up Firebase UIDs for several email addresses at once.
+
+    Recently resolved emails (including ones with no Firebase user) are served
+    from cache; the remaining emails are fetched with Firebase Auth's batch
+    get_users API, one RPC per FIREBASE_GET_USERS_BATCH_SIZE emails.
+
+    Args:
+        emails: Email addresses to resolve
+
+    Returns:
+        Mapping of each email to its Firebase UID, or None if no user was found
+        or the lookup failed
+    """
+    results: Dict[str, Optional[str]] = {}
+    # Normalized email -> the caller's spellings of it that still need a lookup
+    misses: Dict[str, List[str]] = {}
+
+    for email in dict.fromkeys(emails):
+        key = _email_key(email)
+        uid = _cache_get(_firebase_uid_cache, key, _NOT_CACHED)
+        if uid is _NOT_CACHED:
+            misses.setdefault(key, []).append(email)
+        else:
+            results[email] = uid
+
+    if not misses:
+        return results
+
+    try:
+        # Initialize Firebase if needed
+        initialize_firebase()
+        _, _, auth = _fb()
+
+        # EmailIdentifier rejects malformed addresses; fail only those, not their batch
+        identifiers = {}
+        for key, spellings in misses.items():
+            try:
+                identifiers[key] = auth.EmailIdentifier(key)
+            except ValueError as e:
+                logger.warning(f"Skipping Firebase lookup for malformed email {key!r}: {e}")
+                for email in spellings:
+                    results[email] = None
+
+        keys = list(identifiers)
+        for start in range(0, len(keys), FIREBASE_GET_USERS_BATCH_SIZE):
+            batch = keys[start:start + FIREBASE_GET_USERS_BATCH_SIZE]
+            response = auth.get_users([identifiers[key] for key in batch])
+            found = {_email_key(user.email): user.uid for user in response.users if user.email}
+
+            for key in batch:
+                uid = found.get(key)
+                for email in misses[key]:
+                    results[email] = uid
+                ttl = FIREBASE_UID_TTL if uid else FIREBASE_UID_NOT_FOUND_TTL
+                _cache_set(_firebase_uid_cache, key, uid, ttl)
+
+    except Exception as e:
+        logger.error(f"Error looking up Firebase UIDs for {len(misses)} email(s): {e}", exc_info=True)
+        for spellings in misses.values():
+            for email in spellings:
+                results.setdefault(email, None)
+
+    return results
+
+
 def lookup_firebase_uid_by_email(email: str) -> Optional[str]:
     """
     Look up Firebase UID by email address.
@@ -82,25 +299,18 @@ def lookup_firebase_uid_by_email(email: str) -> Optional[str]:
         Firebase UID (string) if found, None otherwise
 
     Note:
-        This function uses Firebase Auth's getUserByEmail which queries Firebase's
-        user database directly. For Profitelligence, users are created via Firebase
-        during signup, so this will find existing users.
+        This is a single-email wrapper around lookup_firebase_uids_by_emails, which
+        queries Firebase's user database directly. For Profitelligence, users are
+        created via Firebase during signup, so this will find existing users.
     """
-    try:
-        # Initialize Firebase if needed
-        initialize_firebase()
+    uid = lookup_firebase_uids_by_emails([email]).get(email)
 
-        # Look up user by email using Firebase Auth
-        user = auth.get_user_by_email(email)
-        logger.info(f"Found Firebase user for email {email}: UID {user.uid}")
-        return user.uid
+    if uid:
+        logger.debug("Found Firebase user for email %s: UID %s", email, uid)
+    else:
+        logger.warning("No Firebase user found for email: %s", email)
 
-    except auth.UserNotFoundError:
-        logger.warning(f"No Firebase user found for email: {email}")
-        return None
-    except Exception as e:
-        logger.error(f"Error looking up Firebase UID for email {email}: {e}", exc_info=True)
-        return None
+    return uid
 
 
 def exchange_google_token_for_firebase_token(google_token: str, expected_audience: str = "profitelligence") -> Dict[str, Any]:
@@ -132,14 +342,14 @@ def exchange_google_token_for_firebase_token(google_token: str, expected_audienc
     """
     try:
         # Step 1: Validate Google OAuth token
-        logger.info("Validating Google OAuth token...")
-        google_claims = validate_google_oauth_token(google_token, expected_audience)
+        logger.debug("Validating Google OAuth token...")
+        google_claims = _validate_google_token_cached(google_token, expected_audience)
         email = google_claims["email"]
         google_sub = google_claims["sub"]
-        logger.info(f"Google token validated for: {email} (sub: {google_sub})")
+        logger.debug("Google token validated for: %s (sub: %s)", email, google_sub)
 
         # Step 2: Look up Firebase UID by email
-        logger.info(f"Looking up Firebase UID for email: {email}")
+        logger.debug("Looking up Firebase UID for email: %s", email)
         firebase_uid = lookup_firebase_uid_by_email(email)
 
         if not firebase_uid:
@@ -150,21 +360,22 @@ def exchange_google_token_for_firebase_token(google_token: str, expected_audienc
             )
 
         # Step 3: Create Firebase custom token with correct UID
-        logger.info(f"Creating Firebase custom token for UID: {firebase_uid}")
-        initialize_firebase()  # Ensure Firebase is initialized
+        # Firebase is already initialized by lookup_firebase_uid_by_email
+        logger.debug("Creating Firebase custom token for UID: %s", firebase_uid)
 
         # Create custom token with additional claims (optional)
         additional_claims = {
             "oauth_provider": "google",
             "google_sub": google_sub
         }
+        _, _, auth = _fb()
         firebase_token = auth.create_custom_token(firebase_uid, additional_claims)
 
         # Firebase returns bytes, decode to string
         if isinstance(firebase_token, bytes):
             firebase_token = firebase_token.decode('utf-8')
 
-        logger.info(f"Successfully created Firebase token for user {email} (UID: {firebase_uid})")
+        logger.info("Successfully created Firebase token for user %s (UID: %s)", email, firebase_uid)
 
         return {
             "firebase_token": firebase_token,
@@ -9,26 +9,54 @@ Fixtures are organized into categories:
 - Sample API responses
 - HTTP mocking helpers
 """
+import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict
+
 import pytest
-import httpx
 import respx
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, Mock, create_autospec
+
+
+# Baseline environment shared by every test
+TEST_ENV = {
+    "PROF_AUTH_METHOD": "api_key",
+    "PROF_API_KEY": "pk_test_abc123",
+    "PROF_API_BASE_URL": "https://test-api.profitelligence.com",
+    "PROF_MCP_MODE": "stdio",
+    "PROF_LOG_LEVEL": "DEBUG",
+}
 
 
 # Set test environment variables before importing config
+@pytest.fixture(scope="session", autouse=True)
+def set_test_env():
+    """Set up test environment variables once for the whole session.
+
+    Tests that need different values use the function-scoped ``monkeypatch``,
+    which restores these baseline values afterwards.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        for name, value in TEST_ENV.items():
+            mp.setenv(name, value)
+        yield
+
+
 @pytest.fixture(autouse=True)
-def set_test_env(monkeypatch):
-    """Set up test environment variables."""
-    # Clear any existing config
-    import src.utils.config as config_module
-    config_module.config = None
+def clear_cached_config():
+    """Reload config around every test.
 
-    # Set minimal required environment
-    monkeypatch.setenv("PROF_AUTH_METHOD", "api_key")
-    monkeypatch.setenv("PROF_API_KEY", "pk_test_abc123")
-    monkeypatch.setenv("PROF_API_BASE_URL", "https://test-api.profitelligence.com")
-    monkeypatch.setenv("PROF_MCP_MODE", "stdio")
-    monkeypatch.setenv("PROF_LOG_LEVEL", "DEBUG")
+    Tests can change PROF_* variables in many ways (monkeypatch, patch.dict,
+    mutate_config), so the config cached by get_config() is always dropped;
+    rebuilding it is cheap.
+    """
+    from src.utils.config import reset_config
+
+    reset_config()
+    yield
+    reset_config()
 
 
 @pytest.fixture
@@ -55,41 +83,52 @@ def test_oauth_token():
     return "ya29.test-oauth-token-abc123"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def base_url():
     """Return the test API base URL."""
     return "https://test-api.profitelligence.com"
 
 
-@pytest.fixture
-def api_client(test_api_key, base_url):
-    """Create a configured API client for testing."""
+@pytest.fixture(scope="session")
+def api_client(request):
+    """Shared API client for the whole session.
+
+    HTTP calls are intercepted by respx at the transport level, so the
+    underlying connection pool is never used and sharing is safe. Tests
+    must not modify client state.
+    """
     from src.utils.api_client import APIClient
 
     client = APIClient(
-        api_key=test_api_key,
+        api_key=TEST_ENV["PROF_API_KEY"],
         auth_method="api_key",
-        base_url=base_url
+        base_url=TEST_ENV["PROF_API_BASE_URL"]
     )
-    yield client
-    client.close()
+    request.addfinalizer(client.close)
+    return client
 
 
 @pytest.fixture
-def mock_config(test_api_key, base_url, monkeypatch):
-    """Create a mock Config object."""
-    from src.utils.config import Config, get_config
-    import src.utils.config as config_module
+def empty_pool(monkeypatch):
+    """Give the test an empty shared connection pool and close what it opens."""
+    from src.utils import api_client as api_client_mod
+
+    pool = {}
+    monkeypatch.setattr(api_client_mod, "_pooled_clients", pool)
+    yield pool
+    for client in pool.values():
+        client.close()
 
-    # Reset the global config
-    config_module.config = None
 
-    # Set environment
-    monkeypatch.setenv("PROF_API_KEY", test_api_key)
-    monkeypatch.setenv("PROF_API_BASE_URL", base_url)
+@pytest.fixture(scope="session")
+def cfg():
+    """Return the baseline test config, resolved once for the session.
 
-    config = get_config()
-    return config
+    Read-only: tests that need different settings should use mutate_config
+    or set PROF_* variables and reload.
+    """
+    from src.utils.config import get_config
+    return get_config()
 
 
 # Config reset fixture - use when tests need fresh config state
@@ -101,15 +140,56 @@ def reset_config():
     and reload configuration.
     """
     import src.utils.config as config_module
-    config_module.config = None
+    config_module.reset_config()
     yield config_module
-    config_module.config = None
+    config_module.reset_config()
+
+
+@pytest.fixture
+def config_module(reset_config):
+    """Return the src.utils.config module with its config cache cleared."""
+    return reset_config
+
+
+@pytest.fixture
+def mutate_config():
+    """Factory fixture that overrides fields on the cached config for one test.
+
+    Fields are set directly without re-validation and restored afterwards, so
+    use this when a test only needs a setting's value. Tests that exercise
+    validators should set PROF_* variables and reload the config instead.
+
+    Usage:
+        mutate_config(auth_method="oauth")
+    """
+    from src.utils.config import get_config
+
+    cfg = get_config()
+    originals = {}
+
+    def _mutate(**fields):
+        for name, value in fields.items():
+            originals.setdefault(name, getattr(cfg, name))
+            object.__setattr__(cfg, name, value)
+        return cfg
+
+    yield _mutate
+
+    for name, value in originals.items():
+        object.__setattr__(cfg, name, value)
 
 
 # Mock HTTP request factory - use for auth testing
+@dataclass(frozen=True)
+class FakeRequest:
+    """Minimal stand-in for a Starlette request; auth code only reads these mappings."""
+    headers: Dict[str, str] = field(default_factory=dict)
+    query_params: Dict[str, str] = field(default_factory=dict)
+
+
 @pytest.fixture
 def mock_http_request():
-    """Factory fixture for creating mock HTTP requests.
+    """Factory fixture for creating fake HTTP requests.
 
     Usage:
         mock_request = mock_http_request(
@@ -118,13 +198,85 @@ def mock_http_request():
         )
     """
     def _create(query_params=None, headers=None):
-        mock = MagicMock()
-        mock.query_params = query_params or {}
-        mock.headers = headers or {}
-        return mock
+        return FakeRequest(headers=headers or {}, query_params=query_params or {})
     return _create
 
 
+@pytest.fixture
+def auth_stub(monkeypatch, mock_http_request):
+    """Factory fixture that makes src.utils.auth see a fake HTTP request.
+
+    Usage:
+        auth_stub(headers={"authorization": "Bearer xxx"})
+    """
+    def _stub(query_params=None, headers=None):
+        request = mock_http_request(query_params=query_params, headers=headers)
+        monkeypatch.setattr("src.utils.auth._get_http_request", lambda: request)
+        return request
+    return _stub
+
+
+@pytest.fixture(scope="session")
+def _client_template():
+    """One API client stub per session, autospecced once against APIClient.
+
+    Calls with a method or signature the real client lacks fail.
+    """
+    from src.utils.api_client import APIClient
+
+    return create_autospec(APIClient, instance=True)
+
+
+@pytest.fixture
+def mock_client(monkeypatch, _client_template):
+    """Replace the API client used by src.tools.mcp_tools with a Mock.
+
+    The session template is reset rather than rebuilt, so configure it only
+    through get (return_value / side_effect), which the reset clears.
+
+    Usage:
+        mock_client.get.return_value = pulse_response
+    """
+    client = _client_template
+    client.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setattr("src.tools.mcp_tools._get_client", lambda ctx=None: client)
+    return client
+
+
+class StubClient:
+    """API client stand-in for tool unit tests.
+
+    get() records (path, params) in ``calls``, then raises ``error`` if set,
+    otherwise returns ``response``.
+    """
+    __slots__ = ("response", "error", "calls")
+
+    def __init__(self, response=None, error=None):
+        self.response = response
+        self.error = error
+        self.calls = []
+
+    def get(self, path, params=None):
+        self.calls.append((path, params))
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+
+@pytest.fixture
+def patched_client(monkeypatch):
+    """Route src.tools.mcp_tools to a StubClient; expose _get_client for call assertions.
+
+    Usage:
+        client, get_client = patched_client
+        client.response = pulse_response
+    """
+    client = StubClient()
+    get_client = Mock(return_value=client)
+    monkeypatch.setattr("src.tools.mcp_tools._get_client", get_client)
+    return client, get_client
+
+
 # MCP Context fixtures - useful for testing tool execution with context
 @pytest.fixture
 def mock_mcp_context():
@@ -159,195 +311,113 @@ def mock_mcp_context_with_api_key(test_api_key):
     return ctx
 
 
-# Sample API response fixtures
-@pytest.fixture
+# Sample API responses, stored as JSON under tests/fixtures/mcp_mocks/<name>.json
+# Each file is read once per process; fixtures hand out the same objects, so tests
+# must treat them as read-only.
+_MOCKS_DIR = Path(__file__).parent / "fixtures" / "mcp_mocks"
+
+
+@lru_cache(maxsize=None)
+def load_fixture(name: str) -> dict:
+    """Return a recorded API response parsed from JSON."""
+    return json.loads((_MOCKS_DIR / f"{name}.json").read_bytes())
+
+
+_PULSE_RESPONSE = load_fixture("pulse")
+_INVESTIGATE_RESPONSE = load_fixture("investigate")
+_SCREEN_RESPONSE = load_fixture("screen")
+_ASSESS_RESPONSE = load_fixture("assess")
+_INSTITUTIONAL_RESPONSE = load_fixture("institutional")
+_SEARCH_RESPONSE = load_fixture("search")
+_SERVICE_INFO_RESPONSE = load_fixture("service_info")
+
+# Sample API response fixtures - shared module constants, so tests must not mutate them
+@pytest.fixture(scope="session")
 def pulse_response():
     """Sample response from /v1/mcp-pulse endpoint."""
-    return {
-        "market_status": "open",
-        "movers": [
-            {"symbol": "AAPL", "change_percent": 2.5, "volume": 100000000},
-            {"symbol": "TSLA", "change_percent": -1.8, "volume": 80000000}
-        ],
-        "filings": [
-            {"symbol": "NVDA", "form_type": "8-K", "summary": "Material event disclosure"}
-        ],
-        "insider_trades": [
-            {"symbol": "META", "insider_name": "John Doe", "transaction_type": "Buy", "value": 500000}
-        ],
-        "indicators": {
-            "sp500": 5200.0,
-            "vix": 15.5
-        }
-    }
+    return _PULSE_RESPONSE
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def investigate_response():
     """Sample response from /v1/mcp-investigate endpoint."""
-    return {
-        "subject": "AAPL",
-        "entity_type": "company",
-        "profile": {
-            "name": "Apple Inc.",
-            "sector": "Technology",
-            "industry": "Consumer Electronics",
-            "market_cap": 3000000000000
-        },
-        "price_history": [
-            {"date": "2024-01-15", "close": 195.50}
-        ],
-        "filings": [
-            {"form_type": "10-K", "filed_date": "2024-01-10"}
-        ],
-        "insider_summary": {
-            "net_shares": 10000,
-            "insider_sentiment": "bullish"
-        }
-    }
+    return _INVESTIGATE_RESPONSE
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def screen_response():
     """Sample response from /v1/mcp-screen endpoint."""
-    return {
-        "focus": "all",
-        "results": [
-            {
-                "symbol": "NVDA",
-                "score": 95.0,
-                "signals": ["insider_buying", "multi_signal"]
-            },
-            {
-                "symbol": "AMD",
-                "score": 85.0,
-                "signals": ["events"]
-            }
-        ],
-        "total": 2
-    }
+    return _SCREEN_RESPONSE
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def assess_response():
     """Sample response from /v1/mcp-assess endpoint."""
-    return {
-        "symbol": "NVDA",
-        "assessment": {
-            "overall_score": 90,
-            "risk_level": "medium",
-            "recommendation": "hold"
-        },
-        "price_action": {
-            "current": 950.0,
-            "change_30d": 15.5
-        },
-        "insider_sentiment": "bullish",
-        "institutional_sentiment": "accumulation"
-    }
+    return _ASSESS_RESPONSE
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def institutional_response():
     """Sample response from /v1/mcp-institutional endpoint."""
-    return {
-        "query_type": "manager",
-        "identifier": "Citadel",
-        "results": [
-            {
-                "name": "CITADEL ADVISORS LLC",
-                "cik": "0001423053",
-                "total_value": 500000000000,
-                "top_holdings": [
-                    {"symbol": "AAPL", "value": 10000000000},
-                    {"symbol": "NVDA", "value": 8000000000}
-                ]
-            }
-        ]
-    }
+    return _INSTITUTIONAL_RESPONSE
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def search_response():
     """Sample response from /v1/search endpoint."""
-    return {
-        "query": "CEO resignation",
-        "results": [
-            {
-                "entity_type": "filing",
-                "entity_id": "12345",
-                "symbol": "XYZ",
-                "title": "XYZ Corp CEO Resignation",
-                "rank": 0.95,
-                "metadata": {"form_type": "8-K", "impact": "HIGH"}
-            }
-        ],
-        "total": 1
-    }
+    return _SEARCH_RESPONSE
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def service_info_response():
     """Sample response from service info endpoint."""
-    return {
-        "service": "profitelligence",
-        "version": "1.0.0",
-        "user": {
-            "email": "test@example.com",
-            "plan": "pro"
-        },
-        "limits": {
-            "requests_per_day": 10000,
-            "requests_remaining": 9500
-        }
-    }
+    return _SERVICE_INFO_RESPONSE
 
 
-# HTTP mocking helper
-@pytest.fixture
-def mock_api(base_url):
-    """Create a respx mock router for API calls."""
-    with respx.mock(base_url=base_url, assert_all_called=False) as respx_mock:
-        yield respx_mock
-
-
-@pytest.fixture
-def mock_pulse_api(mock_api, pulse_response):
-    """Mock the pulse endpoint."""
-    mock_api.get("/v1/mcp-pulse").mock(return_value=httpx.Response(200, json=pulse_response))
-    return mock_api
+@pytest.fixture(scope="session")
+def svc():
+    """Return the service_info module, imported only when a test asks for it."""
+    import src.capabilities.service_info as module
+    return module
 
 
-@pytest.fixture
-def mock_investigate_api(mock_api, investigate_response):
-    """Mock the investigate endpoint."""
-    mock_api.get("/v1/mcp-investigate").mock(return_value=httpx.Response(200, json=investigate_response))
-    return mock_api
+# Static service_info payloads - the helpers are pure, so build each once per session.
+# Tests must treat these as read-only.
+@pytest.fixture(scope="session")
+def pricing_info(svc):
+    """Return the output of service_info._get_pricing_info()."""
+    return svc._get_pricing_info()
 
 
-@pytest.fixture
-def mock_screen_api(mock_api, screen_response):
-    """Mock the screen endpoint."""
-    mock_api.get("/v1/mcp-screen").mock(return_value=httpx.Response(200, json=screen_response))
-    return mock_api
+@pytest.fixture(scope="session")
+def capabilities_info(svc):
+    """Return the output of service_info._get_capabilities_info()."""
+    return svc._get_capabilities_info()
 
 
-@pytest.fixture
-def mock_assess_api(mock_api, assess_response):
-    """Mock the assess endpoint."""
-    mock_api.get("/v1/mcp-assess").mock(return_value=httpx.Response(200, json=assess_response))
-    return mock_api
+@pytest.fixture(scope="session")
+def upgrade_benefits_cache(svc):
+    """Return (benefits, newline-joined benefits) from _get_upgrade_benefits() keyed by tier."""
+    cache = {}
+    for tier in ("free", "pro", "elite"):
+        benefits = svc._get_upgrade_benefits(tier)
+        cache[tier] = (benefits, "\n".join(benefits))
+    return cache
 
 
-@pytest.fixture
-def mock_institutional_api(mock_api, institutional_response):
-    """Mock the institutional endpoint."""
-    mock_api.get("/v1/mcp-institutional").mock(return_value=httpx.Response(200, json=institutional_response))
-    return mock_api
+# HTTP mocking helper
+@pytest.fixture(scope="session")
+def respx_router():
+    """respx router that patches httpx's transport once for the whole session."""
+    with respx.mock(base_url=TEST_ENV["PROF_API_BASE_URL"], assert_all_called=False) as router:
+        yield router
 
 
 @pytest.fixture
-def mock_search_api(mock_api, search_response):
-    """Mock the search endpoint."""
-    mock_api.get("/v1/search").mock(return_value=httpx.Response(200, json=search_response))
-    return mock_api
+def mock_api(respx_router):
+    """Provide the shared respx router with no routes and no recorded calls."""
+    respx_router.routes.clear()
+    respx_router.reset()
+    yield respx_router
+    respx_router.routes.clear()
+    respx_router.reset()
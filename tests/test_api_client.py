@@ -3,76 +3,40 @@ Tests for the API client.
 """
 import pytest
 import httpx
-import respx
 from unittest.mock import patch, MagicMock
 
+from src.utils import api_client as api_client_mod
 from src.utils.api_client import APIClient, ProfitelligenceAPIError, create_client
 
 
 class TestAPIClientInit:
     """Test APIClient initialization."""
 
-    def test_init_with_api_key(self, test_api_key, base_url):
-        """Test client initialization with API key."""
-        client = APIClient(
-            api_key=test_api_key,
-            auth_method="api_key",
-            base_url=base_url
-        )
-
-        assert client.api_key == test_api_key
-        assert client.auth_method == "api_key"
+    @pytest.mark.parametrize("auth_method,kwarg,value_fixture,scheme", [
+        ("api_key", "api_key", "test_api_key", "ApiKey"),
+        ("api_key", "api_key", "test_live_api_key", "ApiKey"),
+        ("firebase_jwt", "firebase_token", "test_firebase_token", "Bearer"),
+        ("oauth", "oauth_token", "test_oauth_token", "Bearer"),
+    ])
+    def test_init_with_credentials(self, request, base_url, auth_method, kwarg, value_fixture, scheme):
+        """Test client initialization for each auth method."""
+        value = request.getfixturevalue(value_fixture)
+        client = APIClient(auth_method=auth_method, base_url=base_url, **{kwarg: value})
+
+        assert client.auth_method == auth_method
         assert client.base_url == base_url
+        assert client._auth_headers == {"Authorization": f"{scheme} {value}"}
         client.close()
 
-    def test_init_with_live_api_key(self, test_live_api_key, base_url):
-        """Test client initialization with live API key."""
-        client = APIClient(
-            api_key=test_live_api_key,
-            auth_method="api_key",
-            base_url=base_url
-        )
-
-        assert client.api_key == test_live_api_key
-        client.close()
-
-    def test_init_with_firebase_token(self, test_firebase_token, base_url):
-        """Test client initialization with Firebase token."""
-        client = APIClient(
-            firebase_token=test_firebase_token,
-            auth_method="firebase_jwt",
-            base_url=base_url
-        )
-
-        assert client.firebase_token == test_firebase_token
-        assert client.auth_method == "firebase_jwt"
-        client.close()
-
-    def test_init_with_oauth_token(self, test_oauth_token, base_url):
-        """Test client initialization with OAuth token."""
-        client = APIClient(
-            oauth_token=test_oauth_token,
-            auth_method="oauth",
-            base_url=base_url
-        )
-
-        assert client.auth_method == "oauth"
-        client.close()
-
-    def test_init_requires_api_key_for_api_key_auth(self, base_url):
-        """Test that api_key auth requires an API key."""
-        with pytest.raises(ValueError, match="API key is required"):
-            APIClient(auth_method="api_key", base_url=base_url)
-
-    def test_init_requires_firebase_token_for_firebase_jwt_auth(self, base_url):
-        """Test that firebase_jwt auth requires a token."""
-        with pytest.raises(ValueError, match="Firebase token is required"):
-            APIClient(auth_method="firebase_jwt", base_url=base_url)
-
-    def test_init_requires_oauth_token_for_oauth_auth(self, base_url):
-        """Test that oauth auth requires a token."""
-        with pytest.raises(ValueError, match="OAuth token is required"):
-            APIClient(auth_method="oauth", base_url=base_url)
+    @pytest.mark.parametrize("auth_method,message", [
+        ("api_key", "API key is required"),
+        ("firebase_jwt", "Firebase token is required"),
+        ("oauth", "OAuth token is required"),
+    ])
+    def test_init_requires_credentials(self, base_url, auth_method, message):
+        """Test that each auth method requires its credential."""
+        with pytest.raises(ValueError, match=message):
+            APIClient(auth_method=auth_method, base_url=base_url)
 
     def test_init_rejects_invalid_auth_method(self, test_api_key, base_url):
         """Test that invalid auth method is rejected."""
@@ -218,17 +182,78 @@ class TestAPIClientPost:
 class TestAPIClientContextManager:
     """Test APIClient context manager protocol."""
 
-    def test_context_manager(self, test_api_key, base_url, mock_api):
+    def test_context_manager(self, test_api_key, base_url):
         """Test client works as context manager."""
-        mock_api.get("/v1/test").mock(return_value=httpx.Response(200, json={}))
+        with patch.object(APIClient, "_build_httpx_client", return_value=MagicMock()) as mock_build:
+            client = APIClient(api_key=test_api_key, auth_method="api_key", base_url=base_url)
 
-        with APIClient(
-            api_key=test_api_key,
-            auth_method="api_key",
-            base_url=base_url
-        ) as client:
-            result = client.get("/v1/test")
-            assert result == {}
+            with client as entered:
+                assert entered is client
+
+        mock_build.assert_called_once_with(f"ApiKey {test_api_key}")
+        client.client.close.assert_called_once()
+
+
+@pytest.mark.usefixtures("empty_pool")
+class TestConnectionPool:
+    """Test pooled APIClients sharing one httpx client per base URL."""
+
+    def test_pooled_clients_share_httpx_client(self, test_api_key, test_live_api_key, base_url):
+        """Test pooled clients for the same base URL reuse one connection pool."""
+        first = APIClient(api_key=test_api_key, base_url=base_url, pooled=True)
+        second = APIClient(api_key=test_live_api_key, base_url=base_url, pooled=True)
+
+        assert first.client is second.client
+        assert "Authorization" not in first.client.headers
+
+    def test_unpooled_client_is_dedicated(self, test_api_key, base_url):
+        """Test clients are not pooled unless asked."""
+        pooled = APIClient(api_key=test_api_key, base_url=base_url, pooled=True)
+        dedicated = APIClient(api_key=test_api_key, base_url=base_url)
+
+        assert dedicated.client is not pooled.client
+        dedicated.close()
+
+    def test_pooled_requests_carry_own_credentials(self, mock_api, test_api_key, test_live_api_key, base_url):
+        """Test each pooled client authenticates with its own credentials."""
+        mock_api.get("/v1/mcp-pulse").mock(return_value=httpx.Response(200, json={}))
+
+        APIClient(api_key=test_api_key, base_url=base_url, pooled=True).get("/v1/mcp-pulse")
+        APIClient(api_key=test_live_api_key, base_url=base_url, pooled=True).get("/v1/mcp-pulse")
+
+        sent = [call.request.headers["authorization"] for call in mock_api.calls]
+        assert sent == [f"ApiKey {test_api_key}", f"ApiKey {test_live_api_key}"]
+
+    def test_pooled_clients_do_not_share_cookies(self, mock_api, test_api_key, test_live_api_key, base_url):
+        """Test a cookie set for one pooled client is never sent by another."""
+        mock_api.get("/v1/mcp-pulse").mock(side_effect=[
+            httpx.Response(200, json={}, headers={"set-cookie": "session=userA; Path=/"}),
+            httpx.Response(200, json={}),
+        ])
+
+        APIClient(api_key=test_api_key, base_url=base_url, pooled=True).get("/v1/mcp-pulse")
+        second = APIClient(api_key=test_live_api_key, base_url=base_url, pooled=True)
+        second.get("/v1/mcp-pulse")
+
+        assert "cookie" not in mock_api.calls.last.request.headers
+        assert not second.client.cookies
+
+    def test_close_leaves_pool_open(self, test_api_key, base_url):
+        """Test closing a pooled client does not close the shared pool."""
+        client = APIClient(api_key=test_api_key, base_url=base_url, pooled=True)
+
+        client.close()
+
+        assert not client.client.is_closed
+
+    def test_close_pooled_clients(self, test_api_key, base_url):
+        """Test close_pooled_clients closes and forgets shared clients."""
+        shared = APIClient(api_key=test_api_key, base_url=base_url, pooled=True).client
+
+        api_client_mod.close_pooled_clients()
+
+        assert shared.is_closed
+        assert APIClient(api_key=test_api_key, base_url=base_url, pooled=True).client is not shared
 
 
 class TestCreateClient:
@@ -284,6 +309,7 @@ class TestProfitelligenceAPIError:
         assert error.response_body is None
 
 
+@pytest.mark.usefixtures("empty_pool")
 class TestCreateClientFromConfig:
     """Test create_client_from_config factory function."""
 
@@ -3,7 +3,14 @@ Integration tests for the MCP server.
 """
 import pytest
 import json
-from unittest.mock import patch, MagicMock, AsyncMock
+from unittest.mock import MagicMock
+
+from src.server import mcp
+
+# Registries resolved once for the module; tests look tools and prompts up here
+_TOOLS = mcp._tool_manager._tools
+_PROMPTS = mcp._prompt_manager._prompts
+_REGISTERED = frozenset(_TOOLS)
 
 
 class TestServerInitialization:
@@ -16,189 +23,118 @@ class TestServerInitialization:
 
     def test_mcp_instance_created(self):
         """Test that FastMCP instance is created."""
-        from src.server import mcp
         assert mcp is not None
         assert mcp.name == "Profitelligence"
 
+    def test_main_closes_pooled_clients_on_shutdown(self, monkeypatch):
+        """Test main() releases the shared API connection pools when the server stops."""
+        from src import server
 
-class TestToolRegistration:
-    """Test that all tools are registered correctly."""
-
-    def test_pulse_tool_registered(self):
-        """Test pulse tool is registered."""
-        from src.server import mcp
-
-        # Get registered tools
-        tools = mcp._tool_manager._tools
-        assert "pulse" in tools
-
-    def test_investigate_tool_registered(self):
-        """Test investigate tool is registered."""
-        from src.server import mcp
-
-        tools = mcp._tool_manager._tools
-        assert "investigate" in tools
-
-    def test_screen_tool_registered(self):
-        """Test screen tool is registered."""
-        from src.server import mcp
-
-        tools = mcp._tool_manager._tools
-        assert "screen" in tools
-
-    def test_assess_tool_registered(self):
-        """Test assess tool is registered."""
-        from src.server import mcp
-
-        tools = mcp._tool_manager._tools
-        assert "assess" in tools
-
-    def test_institutional_tool_registered(self):
-        """Test institutional tool is registered."""
-        from src.server import mcp
+        close = MagicMock()
+        monkeypatch.setattr(server.mcp, "run", MagicMock())
+        monkeypatch.setattr(server, "close_pooled_clients", close)
 
-        tools = mcp._tool_manager._tools
-        assert "institutional" in tools
+        server.main()
 
-    def test_search_tool_registered(self):
-        """Test search tool is registered."""
-        from src.server import mcp
+        server.mcp.run.assert_called_once_with()
+        close.assert_called_once_with()
 
-        tools = mcp._tool_manager._tools
-        assert "search" in tools
 
-    def test_service_info_tool_registered(self):
-        """Test service_info tool is registered."""
-        from src.server import mcp
+class TestToolRegistration:
+    """Test that all tools are registered correctly."""
 
-        tools = mcp._tool_manager._tools
-        assert "service_info" in tools
+    @pytest.mark.parametrize("name", [
+        "pulse", "investigate", "screen", "assess",
+        "institutional", "search", "service_info",
+    ])
+    def test_tool_registered(self, name):
+        """Test each main MCP tool is registered."""
+        assert name in _REGISTERED
 
     def test_all_seven_tools_registered(self):
         """Test that exactly 7 main MCP tools are registered."""
-        from src.server import mcp
-
         expected_tools = {
             "pulse", "investigate", "screen", "assess",
             "institutional", "search", "service_info"
         }
 
-        tools = mcp._tool_manager._tools
-        registered = set(tools.keys())
-
         # Check our expected tools are present
-        assert expected_tools.issubset(registered), \
-            f"Missing tools: {expected_tools - registered}"
+        assert expected_tools.issubset(_REGISTERED), \
+            f"Missing tools: {expected_tools - _REGISTERED}"
 
 
 class TestPromptRegistration:
     """Test that MCP prompts are registered."""
 
-    def test_morning_briefing_prompt_registered(self):
-        """Test morning_briefing prompt is registered."""
-        from src.server import mcp
-
-        prompts = mcp._prompt_manager._prompts
-        assert "morning_briefing" in prompts
-
-    def test_company_intelligence_report_prompt_registered(self):
-        """Test company_intelligence_report prompt is registered."""
-        from src.server import mcp
-
-        prompts = mcp._prompt_manager._prompts
-        assert "company_intelligence_report" in prompts
-
-    def test_position_risk_check_prompt_registered(self):
-        """Test position_risk_check prompt is registered."""
-        from src.server import mcp
-
-        prompts = mcp._prompt_manager._prompts
-        assert "position_risk_check" in prompts
-
-    def test_smart_money_report_prompt_registered(self):
-        """Test smart_money_report prompt is registered."""
-        from src.server import mcp
-
-        prompts = mcp._prompt_manager._prompts
-        assert "smart_money_report" in prompts
-
-    def test_sector_scan_prompt_registered(self):
-        """Test sector_scan prompt is registered."""
-        from src.server import mcp
-
-        prompts = mcp._prompt_manager._prompts
-        assert "sector_scan" in prompts
-
-    def test_insider_deep_dive_prompt_registered(self):
-        """Test insider_deep_dive prompt is registered."""
-        from src.server import mcp
-
-        prompts = mcp._prompt_manager._prompts
-        assert "insider_deep_dive" in prompts
+    @pytest.mark.parametrize("name", [
+        "morning_briefing", "company_intelligence_report", "position_risk_check",
+        "smart_money_report", "sector_scan", "insider_deep_dive",
+    ])
+    def test_prompt_registered(self, name):
+        """Test each MCP prompt is registered."""
+        assert name in _PROMPTS
 
 
 class TestToolExecution:
     """Test tool execution through the MCP server."""
 
-    def test_pulse_tool_returns_json(self, mock_config, pulse_response):
+    def test_pulse_tool_returns_json(self, mock_client, pulse_response):
         """Test pulse tool returns JSON-serialized response."""
-        from src.server import mcp
-        from src.tools import mcp_tools
-
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = pulse_response
-            mock_get_client.return_value = mock_client
+        mock_client.get.return_value = pulse_response
 
-            # Get the tool function
-            tool_func = mcp._tool_manager._tools["pulse"].fn
+        # Get the tool function
+        tool_func = _TOOLS["pulse"].fn
 
-            # Call with mock context
-            mock_ctx = MagicMock()
-            result = tool_func(mock_ctx)
+        # Call with mock context
+        mock_ctx = MagicMock()
+        result = tool_func(mock_ctx)
 
-            # Result should be JSON string
-            assert isinstance(result, str)
-            parsed = json.loads(result)
-            assert parsed == pulse_response
+        # Result should be JSON string
+        assert isinstance(result, str)
+        parsed = json.loads(result)
+        assert parsed == pulse_response
 
-    def test_investigate_tool_returns_json(self, mock_config, investigate_response):
+    def test_investigate_tool_returns_json(self, mock_client, investigate_response):
         """Test investigate tool returns JSON-serialized response."""
-        from src.server import mcp
-        from src.tools import mcp_tools
+        mock_client.get.return_value = investigate_response
 
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = investigate_response
-            mock_get_client.return_value = mock_client
+        tool_func = _TOOLS["investigate"].fn
 
-            tool_func = mcp._tool_manager._tools["investigate"].fn
+        mock_ctx = MagicMock()
+        result = tool_func("AAPL", None, 30, mock_ctx)
 
-            mock_ctx = MagicMock()
-            result = tool_func("AAPL", None, 30, mock_ctx)
+        assert isinstance(result, str)
+        parsed = json.loads(result)
+        assert parsed == investigate_response
 
-            assert isinstance(result, str)
-            parsed = json.loads(result)
-            assert parsed == investigate_response
-
-    def test_screen_tool_returns_json(self, mock_config, screen_response):
+    def test_screen_tool_returns_json(self, mock_client, screen_response):
         """Test screen tool returns JSON-serialized response."""
-        from src.server import mcp
-        from src.tools import mcp_tools
+        mock_client.get.return_value = screen_response
+
+        tool_func = _TOOLS["screen"].fn
+
+        mock_ctx = MagicMock()
+        result = tool_func("all", None, None, 7, 25, mock_ctx)
+
+        assert isinstance(result, str)
+        parsed = json.loads(result)
+        assert parsed == screen_response
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_tool_json_round_trips(self, monkeypatch, screen_response, use_orjson):
+        """Test tool results decode back to the same data with and without orjson."""
+        from src import server
 
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = screen_response
-            mock_get_client.return_value = mock_client
+        if not use_orjson:
+            monkeypatch.setattr(server, "orjson", None)
 
-            tool_func = mcp._tool_manager._tools["screen"].fn
+        assert json.loads(server._to_json(screen_response)) == screen_response
 
-            mock_ctx = MagicMock()
-            result = tool_func("all", None, None, 7, 25, mock_ctx)
+    def test_tool_json_handles_big_integers(self):
+        """Test values orjson cannot encode fall back to the stdlib encoder."""
+        from src import server
 
-            assert isinstance(result, str)
-            parsed = json.loads(result)
-            assert parsed == screen_response
+        assert json.loads(server._to_json({"volume": 2 ** 70})) == {"volume": 2 ** 70}
 
 
 class TestToolDescriptions:
@@ -206,25 +142,19 @@ class TestToolDescriptions:
 
     def test_pulse_has_description(self):
         """Test pulse tool has a description."""
-        from src.server import mcp
-
-        tool = mcp._tool_manager._tools["pulse"]
+        tool = _TOOLS["pulse"]
         assert tool.description is not None
         assert len(tool.description) > 0
 
     def test_investigate_has_description(self):
         """Test investigate tool has a description."""
-        from src.server import mcp
-
-        tool = mcp._tool_manager._tools["investigate"]
+        tool = _TOOLS["investigate"]
         assert tool.description is not None
         assert "research" in tool.description.lower() or "entity" in tool.description.lower()
 
     def test_screen_has_description(self):
         """Test screen tool has a description."""
-        from src.server import mcp
-
-        tool = mcp._tool_manager._tools["screen"]
+        tool = _TOOLS["screen"]
         assert tool.description is not None
         assert "scan" in tool.description.lower() or "screen" in tool.description.lower()
 
@@ -232,22 +162,17 @@ class TestToolDescriptions:
 class TestErrorHandling:
     """Test error handling in tool execution."""
 
-    def test_tool_handles_api_error(self, mock_config):
+    def test_tool_handles_api_error(self, mock_client):
         """Test that tools properly propagate API errors."""
-        from src.server import mcp
-        from src.tools import mcp_tools
         from src.utils.api_client import ProfitelligenceAPIError
 
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.side_effect = ProfitelligenceAPIError(
-                message="API Error",
-                status_code=500
-            )
-            mock_get_client.return_value = mock_client
+        mock_client.get.side_effect = ProfitelligenceAPIError(
+            message="API Error",
+            status_code=500
+        )
 
-            tool_func = mcp._tool_manager._tools["pulse"].fn
-            mock_ctx = MagicMock()
+        tool_func = _TOOLS["pulse"].fn
+        mock_ctx = MagicMock()
 
-            with pytest.raises(ProfitelligenceAPIError):
-                tool_func(mock_ctx)
+        with pytest.raises(ProfitelligenceAPIError):
+            tool_func(mock_ctx)
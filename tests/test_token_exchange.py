@@ -0,0 +1,342 @@
+"""
+Tests for Google → Firebase token exchange.
+"""
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import src.utils.token_exchange as token_exchange
+
+REPO_ROOT = Path(__file__).parents[1]
+
+
+class Recorder:
+    """Callable stand-in that records its arguments in ``calls``.
+
+    Raises ``error`` if set, otherwise returns ``result``.
+    """
+    __slots__ = ("result", "error", "calls")
+
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.calls = []
+
+    def __call__(self, *args):
+        self.calls.append(args)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class FakeAuth:
+    """Stand-in for firebase_admin.auth backed by an email -> UID mapping.
+
+    get_users() records each batch of identifiers in ``get_users_calls`` and
+    raises ``error`` if set. Emails match case-insensitively, as in Firebase.
+    """
+
+    def __init__(self, users=None):
+        self.users = dict(users or {})
+        self.error = None
+        self.get_users_calls = []
+
+    @staticmethod
+    def EmailIdentifier(email):
+        if "@" not in email:
+            raise ValueError("Malformed email address string")
+        return email
+
+    def get_users(self, identifiers):
+        self.get_users_calls.append(identifiers)
+        if self.error is not None:
+            raise self.error
+        wanted = {email.lower() for email in identifiers}
+        return SimpleNamespace(users=[
+            SimpleNamespace(email=email, uid=uid)
+            for email, uid in self.users.items() if email.lower() in wanted
+        ])
+
+    def create_custom_token(self, uid, claims):
+        return b"firebase-custom-token"
+
+
+@pytest.fixture(autouse=True)
+def clear_token_caches():
+    """Start every test with empty token exchange caches."""
+    caches = (
+        token_exchange._google_claims_cache,
+        token_exchange._firebase_uid_cache,
+    )
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+
+@pytest.fixture
+def firebase_env(monkeypatch, reset_config):
+    """Configure inline service account credentials and a fresh Firebase app slot."""
+    monkeypatch.setenv("PROF_FIREBASE_SERVICE_ACCOUNT_JSON", '{"type": "service_account"}')
+    monkeypatch.setattr(token_exchange, "_firebase_app", None)
+    token_exchange._load_firebase_credentials.cache_clear()
+    yield
+    token_exchange._load_firebase_credentials.cache_clear()
+
+
+@pytest.fixture
+def fake_auth(monkeypatch):
+    """Replace the lazily imported firebase_admin.auth module with a FakeAuth."""
+    auth = FakeAuth()
+    monkeypatch.setattr(token_exchange, "_fb", lambda: (SimpleNamespace(), SimpleNamespace(), auth))
+    return auth
+
+
+@pytest.fixture
+def validate(monkeypatch):
+    """Replace Google token validation with a Recorder returning fresh claims."""
+    recorder = Recorder(result=_claims())
+    monkeypatch.setattr(token_exchange, "validate_google_oauth_token", recorder)
+    return recorder
+
+
+def _claims(ttl=3600):
+    """Build a validated Google claims dict expiring in `ttl` seconds."""
+    return {
+        "sub": "google_sub_123",
+        "email": "user@example.com",
+        "aud": "profitelligence",
+        "exp": int(time.time()) + ttl,
+    }
+
+
+class TestGoogleClaimsCache:
+    """Test caching of validated Google token claims."""
+
+    def test_repeated_token_validated_once(self, validate):
+        """Test the same token is only validated once within the TTL."""
+        first = token_exchange._validate_google_token_cached("google-token", "profitelligence")
+        second = token_exchange._validate_google_token_cached("google-token", "profitelligence")
+
+        assert first == second
+        assert validate.calls == [("google-token", "profitelligence")]
+
+    def test_different_audience_is_validated_separately(self, validate):
+        """Test cached claims are scoped to the expected audience."""
+        token_exchange._validate_google_token_cached("google-token", "profitelligence")
+        token_exchange._validate_google_token_cached("google-token", "other-audience")
+
+        assert len(validate.calls) == 2
+
+    def test_expiring_token_is_not_cached(self, validate):
+        """Test claims are never reused past the token's exp claim."""
+        validate.result = _claims(ttl=-1)
+
+        token_exchange._validate_google_token_cached("google-token", "profitelligence")
+        token_exchange._validate_google_token_cached("google-token", "profitelligence")
+
+        assert len(validate.calls) == 2
+
+    def test_raw_token_not_stored(self, validate):
+        """Test the cache is keyed by digest, not by the raw token."""
+        token_exchange._validate_google_token_cached("google-token", "profitelligence")
+
+        (digest, audience), = token_exchange._google_claims_cache.keys()
+        assert digest == token_exchange._token_digest("google-token")
+        assert "google-token" not in repr(token_exchange._google_claims_cache)
+
+    def test_invalid_token_not_cached(self, validate):
+        """Test validation errors propagate and nothing is cached."""
+        validate.error = ValueError("Token has expired")
+
+        with pytest.raises(ValueError, match="Token has expired"):
+            token_exchange._validate_google_token_cached("google-token", "profitelligence")
+
+        assert token_exchange._google_claims_cache == {}
+
+
+class TestLazyFirebaseImport:
+    """Test the Firebase Admin SDK is imported on first use."""
+
+    def test_module_import_does_not_load_firebase_admin(self):
+        """Test importing token_exchange leaves firebase_admin unloaded."""
+        code = (
+            "import sys; import src.utils.token_exchange; "
+            "sys.exit('firebase_admin' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True
+        )
+
+        assert result.returncode == 0, result.stderr
+
+
+class TestInitializeFirebase:
+    """Test Firebase Admin SDK initialization."""
+
+    @pytest.fixture
+    def fake_sdk(self, monkeypatch):
+        """Replace firebase_admin and its credentials module with recording stubs.
+
+        Returns (certificate, initialize_app) Recorders.
+        """
+        certificate = Recorder(result="parsed-credentials")
+        initialize_app = Recorder(result="firebase-app")
+        monkeypatch.setattr(token_exchange, "_fb", lambda: (
+            SimpleNamespace(initialize_app=initialize_app),
+            SimpleNamespace(Certificate=certificate),
+            FakeAuth(),
+        ))
+        return certificate, initialize_app
+
+    def test_requires_service_account_config(self, reset_config, monkeypatch):
+        """Test initialization fails without service account credentials."""
+        monkeypatch.setattr(token_exchange, "_firebase_app", None)
+
+        with pytest.raises(ValueError, match="service account credentials not configured"):
+            token_exchange.initialize_firebase()
+
+    def test_initializes_once_under_concurrency(self, firebase_env, monkeypatch):
+        """Test concurrent callers share a single initialization."""
+        certificate = Recorder(result="parsed-credentials")
+        init_calls = []
+
+        def slow_initialize_app(cred):
+            init_calls.append(cred)
+            time.sleep(0.05)
+            return "firebase-app"
+
+        monkeypatch.setattr(token_exchange, "_fb", lambda: (
+            SimpleNamespace(initialize_app=slow_initialize_app),
+            SimpleNamespace(Certificate=certificate),
+            FakeAuth(),
+        ))
+
+        threads = [threading.Thread(target=token_exchange.initialize_firebase) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert certificate.calls == [({"type": "service_account"},)]
+        assert init_calls == ["parsed-credentials"]
+        assert token_exchange._firebase_app == "firebase-app"
+
+    def test_reinitialization_reuses_parsed_credentials(self, firebase_env, fake_sdk, monkeypatch):
+        """Test the service account is only parsed once for unchanged config."""
+        certificate, initialize_app = fake_sdk
+
+        token_exchange.initialize_firebase()
+        monkeypatch.setattr(token_exchange, "_firebase_app", None)
+        token_exchange.initialize_firebase()
+
+        assert len(certificate.calls) == 1
+        assert len(initialize_app.calls) == 2
+
+
+class TestLookupFirebaseUids:
+    """Test batched Firebase UID lookups."""
+
+    @pytest.fixture(autouse=True)
+    def stub_initialize(self, monkeypatch):
+        """Skip Firebase initialization."""
+        monkeypatch.setattr(token_exchange, "initialize_firebase", Recorder())
+
+    def test_batches_emails_into_one_call(self, fake_auth):
+        """Test several emails resolve with a single get_users call."""
+        fake_auth.users = {"a@example.com": "uid_a", "b@example.com": "uid_b"}
+
+        result = token_exchange.lookup_firebase_uids_by_emails(
+            ["a@example.com", "b@example.com", "missing@example.com"]
+        )
+
+        assert result == {"a@example.com": "uid_a", "b@example.com": "uid_b", "missing@example.com": None}
+        assert fake_auth.get_users_calls == [["a@example.com", "b@example.com", "missing@example.com"]]
+
+    def test_cached_emails_skip_lookup(self, fake_auth):
+        """Test found and not-found results are both served from cache."""
+        fake_auth.users = {"a@example.com": "uid_a"}
+        token_exchange.lookup_firebase_uids_by_emails(["a@example.com", "missing@example.com"])
+
+        result = token_exchange.lookup_firebase_uids_by_emails(["a@example.com", "missing@example.com"])
+
+        assert result == {"a@example.com": "uid_a", "missing@example.com": None}
+        assert len(fake_auth.get_users_calls) == 1
+
+    def test_only_uncached_emails_are_fetched(self, fake_auth):
+        """Test a partially cached request only fetches the misses."""
+        fake_auth.users = {"a@example.com": "uid_a", "b@example.com": "uid_b"}
+        token_exchange.lookup_firebase_uids_by_emails(["a@example.com"])
+
+        result = token_exchange.lookup_firebase_uids_by_emails(["a@example.com", "b@example.com"])
+
+        assert result == {"a@example.com": "uid_a", "b@example.com": "uid_b"}
+        assert fake_auth.get_users_calls[-1] == ["b@example.com"]
+
+    def test_email_keys_are_case_and_whitespace_insensitive(self, fake_auth):
+        """Test differently formatted spellings of an email share one cache entry."""
+        fake_auth.users = {"User@Example.com": "uid_a"}
+        token_exchange.lookup_firebase_uids_by_emails(["user@example.com", " USER@example.com"])
+
+        result = token_exchange.lookup_firebase_uids_by_emails(["User@Example.COM"])
+
+        assert result == {"User@Example.COM": "uid_a"}
+        assert fake_auth.get_users_calls == [["user@example.com"]]
+        assert list(token_exchange._firebase_uid_cache) == ["user@example.com"]
+
+    def test_malformed_email_does_not_fail_its_batch(self, fake_auth):
+        """Test a malformed email resolves to None while the rest of its batch is looked up."""
+        fake_auth.users = {"a@example.com": "uid_a"}
+
+        result = token_exchange.lookup_firebase_uids_by_emails(
+            ["a@example.com", "not-an-email", "missing@example.com"]
+        )
+
+        assert result == {"a@example.com": "uid_a", "not-an-email": None, "missing@example.com": None}
+        assert fake_auth.get_users_calls == [["a@example.com", "missing@example.com"]]
+
+    def test_errors_return_none_and_are_not_cached(self, fake_auth):
+        """Test lookup failures return None without caching a negative result."""
+        fake_auth.error = Exception("Firebase unavailable")
+
+        assert token_exchange.lookup_firebase_uid_by_email("a@example.com") is None
+        assert token_exchange._firebase_uid_cache == {}
+
+    def test_single_email_wrapper(self, fake_auth):
+        """Test the single-email API delegates to the batch lookup."""
+        fake_auth.users = {"a@example.com": "uid_a"}
+
+        assert token_exchange.lookup_firebase_uid_by_email("a@example.com") == "uid_a"
+
+
+class TestExchangeGoogleToken:
+    """Test the full Google → Firebase token exchange."""
+
+    def test_exchange_initializes_firebase_once(self, fake_auth, validate, monkeypatch):
+        """Test exchange relies on the lookup step for Firebase initialization."""
+        initialize = Recorder()
+        monkeypatch.setattr(token_exchange, "initialize_firebase", initialize)
+        fake_auth.users = {"user@example.com": "firebase_uid_abc"}
+
+        result = token_exchange.exchange_google_token_for_firebase_token("google-token")
+
+        assert len(initialize.calls) == 1
+        assert result == {
+            "firebase_token": "firebase-custom-token",
+            "email": "user@example.com",
+            "firebase_uid": "firebase_uid_abc",
+            "google_sub": "google_sub_123",
+        }
+
+    def test_exchange_raises_for_unknown_user(self, validate, monkeypatch):
+        """Test exchange fails when the Google email has no Firebase account."""
+        monkeypatch.setattr(token_exchange, "lookup_firebase_uid_by_email", Recorder(result=None))
+
+        with pytest.raises(ValueError, match="User not found"):
+            token_exchange.exchange_google_token_for_firebase_token("google-token")
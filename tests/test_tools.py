@@ -7,438 +7,284 @@ Tests are structured in two levels:
 """
 import pytest
 import httpx
-import respx
-from unittest.mock import patch, MagicMock
+from unittest.mock import Mock
 
 from src.tools import mcp_tools
+from src.utils import api_client
 from src.utils.api_client import ProfitelligenceAPIError
 
 
+def last_params(requests):
+    """Return the decoded query params of the last request sent through http_routes."""
+    return dict(requests[-1].url.params)
+
+
+# Default query params each tool sends; expected calls override only what differs
+_INVESTIGATE_DEFAULTS = {"days": 30}
+_SCREEN_DEFAULTS = {"focus": "all", "days": 7, "limit": 25}
+_ASSESS_DEFAULTS = {"days": 30}
+_INSTITUTIONAL_DEFAULTS = {"limit": 25}
+_SEARCH_DEFAULTS = {"limit": 20}
+
+# Expected (path, params) pairs recorded by StubClient.get()
+_PULSE_CALL = ("/v1/mcp-pulse", None)
+_INVESTIGATE_AAPL_30 = ("/v1/mcp-investigate", {"subject": "AAPL", **_INVESTIGATE_DEFAULTS})
+_INVESTIGATE_SECTOR = ("/v1/mcp-investigate", {"subject": "Technology", "type": "sector", **_INVESTIGATE_DEFAULTS})
+_INVESTIGATE_AAPL_90 = ("/v1/mcp-investigate", {**_INVESTIGATE_DEFAULTS, "subject": "AAPL", "days": 90})
+_SCREEN_DEFAULT = ("/v1/mcp-screen", _SCREEN_DEFAULTS)
+_ASSESS_NVDA_30 = ("/v1/mcp-assess", {"symbol": "NVDA", **_ASSESS_DEFAULTS})
+_ASSESS_AAPL_90 = ("/v1/mcp-assess", {**_ASSESS_DEFAULTS, "symbol": "AAPL", "days": 90})
+_SEARCH_BASIC = ("/v1/search", {"q": "CEO resignation", **_SEARCH_DEFAULTS})
+
+
 class TestPulseTool:
     """Test the pulse() tool."""
 
-    def test_pulse_returns_market_snapshot(self, mock_config, mock_pulse_api, pulse_response):
+    def test_pulse_returns_market_snapshot(self, patched_client, pulse_response):
         """Test pulse returns market data."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = pulse_response
-            mock_get_client.return_value = mock_client
+        client, _ = patched_client
+        client.response = pulse_response
 
-            result = mcp_tools.pulse()
+        result = mcp_tools.pulse()
 
-            assert result == pulse_response
-            mock_client.get.assert_called_once_with("/v1/mcp-pulse")
+        assert result == pulse_response
+        assert client.calls == [_PULSE_CALL]
 
-    def test_pulse_passes_context(self, mock_config):
+    def test_pulse_passes_context(self, patched_client):
         """Test pulse passes context to client."""
-        mock_ctx = MagicMock()
+        mock_ctx = object()
 
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = {}
-            mock_get_client.return_value = mock_client
+        client, get_client = patched_client
+        client.response = {}
 
-            mcp_tools.pulse(ctx=mock_ctx)
+        mcp_tools.pulse(ctx=mock_ctx)
 
-            mock_get_client.assert_called_once_with(mock_ctx)
+        get_client.assert_called_once_with(mock_ctx)
 
 
 class TestInvestigateTool:
     """Test the investigate() tool."""
 
-    def test_investigate_company(self, mock_config, investigate_response):
+    def test_investigate_company(self, patched_client, investigate_response):
         """Test investigating a company by symbol."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = investigate_response
-            mock_get_client.return_value = mock_client
+        client, _ = patched_client
+        client.response = investigate_response
 
-            result = mcp_tools.investigate("AAPL")
+        result = mcp_tools.investigate("AAPL")
 
-            assert result == investigate_response
-            mock_client.get.assert_called_once_with(
-                "/v1/mcp-investigate",
-                params={"subject": "AAPL", "days": 30}
-            )
+        assert result == investigate_response
+        assert client.calls == [_INVESTIGATE_AAPL_30]
 
-    def test_investigate_with_entity_type(self, mock_config):
+    def test_investigate_with_entity_type(self, patched_client):
         """Test investigating with explicit entity type."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = {}
-            mock_get_client.return_value = mock_client
+        client, _ = patched_client
+        client.response = {}
 
-            mcp_tools.investigate("Technology", entity_type="sector")
+        mcp_tools.investigate("Technology", entity_type="sector")
 
-            mock_client.get.assert_called_once_with(
-                "/v1/mcp-investigate",
-                params={"subject": "Technology", "type": "sector", "days": 30}
-            )
+        assert client.calls == [_INVESTIGATE_SECTOR]
 
-    def test_investigate_with_custom_days(self, mock_config):
+    def test_investigate_with_custom_days(self, patched_client):
         """Test investigating with custom lookback period."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = {}
-            mock_get_client.return_value = mock_client
+        client, _ = patched_client
+        client.response = {}
 
-            mcp_tools.investigate("AAPL", days=90)
+        mcp_tools.investigate("AAPL", days=90)
 
-            mock_client.get.assert_called_once_with(
-                "/v1/mcp-investigate",
-                params={"subject": "AAPL", "days": 90}
-            )
+        assert client.calls == [_INVESTIGATE_AAPL_90]
 
-    def test_investigate_insider_by_cik(self, mock_config):
+    def test_investigate_insider_by_cik(self, patched_client):
         """Test investigating an insider by CIK."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = {"entity_type": "insider"}
-            mock_get_client.return_value = mock_client
+        client, _ = patched_client
+        client.response = {"entity_type": "insider"}
 
-            result = mcp_tools.investigate("0001067983")
+        result = mcp_tools.investigate("0001067983")
 
-            assert result["entity_type"] == "insider"
+        assert result["entity_type"] == "insider"
 
 
 class TestScreenTool:
     """Test the screen() tool."""
 
-    def test_screen_default_params(self, mock_config, screen_response):
+    def test_screen_default_params(self, patched_client, screen_response):
         """Test screening with default parameters."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = screen_response
-            mock_get_client.return_value = mock_client
+        client, _ = patched_client
+        client.response = screen_response
 
-            result = mcp_tools.screen()
+        result = mcp_tools.screen()
 
-            assert result == screen_response
-            mock_client.get.assert_called_once_with(
-                "/v1/mcp-screen",
-                params={"focus": "all", "days": 7, "limit": 25}
-            )
+        assert result == screen_response
+        assert client.calls == [_SCREEN_DEFAULT]
 
-    def test_screen_with_focus(self, mock_config):
-        """Test screening with specific focus."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = {}
-            mock_get_client.return_value = mock_client
+    @pytest.mark.parametrize("kw,val", [
+        ("focus", "insider"),
+        ("sector", "Technology"),
+        ("min_score", 80.0),
+    ])
+    def test_screen_param_forwarded(self, patched_client, kw, val):
+        """Test each screen filter is forwarded as a query param."""
+        client, _ = patched_client
+        client.response = {}
 
-            mcp_tools.screen(focus="insider")
+        mcp_tools.screen(**{kw: val})
 
-            mock_client.get.assert_called_once_with(
-                "/v1/mcp-screen",
-                params={"focus": "insider", "days": 7, "limit": 25}
-            )
-
-    def test_screen_with_sector_filter(self, mock_config):
-        """Test screening with sector filter."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = {}
-            mock_get_client.return_value = mock_client
-
-            mcp_tools.screen(sector="Technology")
-
-            call_args = mock_client.get.call_args
-            assert call_args[1]["params"]["sector"] == "Technology"
-
-    def test_screen_with_min_score(self, mock_config):
-        """Test screening with minimum score."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = {}
-            mock_get_client.return_value = mock_client
-
-            mcp_tools.screen(min_score=80.0)
-
-            call_args = mock_client.get.call_args
-            assert call_args[1]["params"]["min_score"] == 80.0
+        assert client.calls[-1][1][kw] == val
 
 
 class TestAssessTool:
     """Test the assess() tool."""
 
-    def test_assess_symbol(self, mock_config, assess_response):
+    def test_assess_symbol(self, patched_client, assess_response):
         """Test assessing a stock position."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = assess_response
-            mock_get_client.return_value = mock_client
+        client, _ = patched_client
+        client.response = assess_response
 
-            result = mcp_tools.assess("NVDA")
+        result = mcp_tools.assess("NVDA")
 
-            assert result == assess_response
-            mock_client.get.assert_called_once_with(
-                "/v1/mcp-assess",
-                params={"symbol": "NVDA", "days": 30}
-            )
+        assert result == assess_response
+        assert client.calls == [_ASSESS_NVDA_30]
 
-    def test_assess_with_custom_days(self, mock_config):
+    def test_assess_with_custom_days(self, patched_client):
         """Test assessing with custom lookback period."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = {}
-            mock_get_client.return_value = mock_client
+        client, _ = patched_client
+        client.response = {}
 
-            mcp_tools.assess("AAPL", days=90)
+        mcp_tools.assess("AAPL", days=90)
 
-            mock_client.get.assert_called_once_with(
-                "/v1/mcp-assess",
-                params={"symbol": "AAPL", "days": 90}
-            )
+        assert client.calls == [_ASSESS_AAPL_90]
 
 
 class TestInstitutionalTool:
     """Test the institutional() tool."""
 
-    def test_institutional_manager_query(self, mock_config, institutional_response):
-        """Test institutional manager query."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = institutional_response
-            mock_get_client.return_value = mock_client
+    @pytest.mark.parametrize("args,kwargs,expected", [
+        (("manager",), {"identifier": "Citadel"},
+         {"query_type": "manager", "identifier": "Citadel", **_INSTITUTIONAL_DEFAULTS}),
+        (("security",), {"identifier": "NVDA"},
+         {"query_type": "security", "identifier": "NVDA", **_INSTITUTIONAL_DEFAULTS}),
+        (("signal",), {"signal_type": "accumulation"},
+         {"query_type": "signal", "signal_type": "accumulation", **_INSTITUTIONAL_DEFAULTS}),
+        (("manager",), {"identifier": "Berkshire", "limit": 50},
+         {**_INSTITUTIONAL_DEFAULTS, "query_type": "manager", "identifier": "Berkshire", "limit": 50}),
+    ], ids=["manager", "security", "signal", "custom-limit"])
+    def test_institutional_forwards_params(self, patched_client, institutional_response,
+                                           args, kwargs, expected):
+        """Test institutional forwards each query shape and returns the response."""
+        client, _ = patched_client
+        client.response = institutional_response
 
-            result = mcp_tools.institutional("manager", identifier="Citadel")
+        result = mcp_tools.institutional(*args, **kwargs)
 
-            assert result == institutional_response
-            mock_client.get.assert_called_once_with(
-                "/v1/mcp-institutional",
-                params={"query_type": "manager", "identifier": "Citadel", "limit": 25}
-            )
-
-    def test_institutional_security_query(self, mock_config):
-        """Test institutional security query."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = {}
-            mock_get_client.return_value = mock_client
-
-            mcp_tools.institutional("security", identifier="NVDA")
-
-            mock_client.get.assert_called_once_with(
-                "/v1/mcp-institutional",
-                params={"query_type": "security", "identifier": "NVDA", "limit": 25}
-            )
-
-    def test_institutional_signal_query(self, mock_config):
-        """Test institutional signal query."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = {}
-            mock_get_client.return_value = mock_client
-
-            mcp_tools.institutional("signal", signal_type="accumulation")
-
-            mock_client.get.assert_called_once_with(
-                "/v1/mcp-institutional",
-                params={"query_type": "signal", "signal_type": "accumulation", "limit": 25}
-            )
-
-    def test_institutional_with_custom_limit(self, mock_config):
-        """Test institutional query with custom limit."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = {}
-            mock_get_client.return_value = mock_client
-
-            mcp_tools.institutional("manager", identifier="Berkshire", limit=50)
-
-            call_args = mock_client.get.call_args
-            assert call_args[1]["params"]["limit"] == 50
+        assert result == institutional_response
+        assert client.calls == [("/v1/mcp-institutional", expected)]
 
 
 class TestSearchTool:
     """Test the search() tool."""
 
-    def test_search_basic_query(self, mock_config, search_response):
+    def test_search_basic_query(self, patched_client, search_response):
         """Test basic search query."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = search_response
-            mock_get_client.return_value = mock_client
-
-            result = mcp_tools.search("CEO resignation")
-
-            assert result == search_response
-            mock_client.get.assert_called_once_with(
-                "/v1/search",
-                params={"q": "CEO resignation", "limit": 20}
-            )
-
-    def test_search_with_entity_type(self, mock_config):
-        """Test search with entity type filter."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = {}
-            mock_get_client.return_value = mock_client
-
-            mcp_tools.search("NVIDIA", entity_type="company")
-
-            call_args = mock_client.get.call_args
-            assert call_args[1]["params"]["entity_type"] == "company"
-
-    def test_search_with_sector(self, mock_config):
-        """Test search with sector filter."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = {}
-            mock_get_client.return_value = mock_client
+        client, _ = patched_client
+        client.response = search_response
 
-            mcp_tools.search("acquisition", sector="Technology")
+        result = mcp_tools.search("CEO resignation")
 
-            call_args = mock_client.get.call_args
-            assert call_args[1]["params"]["sector"] == "Technology"
+        assert result == search_response
+        assert client.calls == [_SEARCH_BASIC]
 
-    def test_search_with_impact(self, mock_config):
-        """Test search with impact filter."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = {}
-            mock_get_client.return_value = mock_client
+    @pytest.mark.parametrize("kw,val", [
+        ("entity_type", "company"),
+        ("sector", "Technology"),
+        ("impact", "HIGH"),
+        ("limit", 50),
+    ])
+    def test_search_param_forwarded(self, patched_client, kw, val):
+        """Test each search filter is forwarded as a query param."""
+        client, _ = patched_client
+        client.response = {}
 
-            mcp_tools.search("merger", impact="HIGH")
+        mcp_tools.search("NVIDIA", **{kw: val})
 
-            call_args = mock_client.get.call_args
-            assert call_args[1]["params"]["impact"] == "HIGH"
-
-    def test_search_with_custom_limit(self, mock_config):
-        """Test search with custom limit."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = {}
-            mock_get_client.return_value = mock_client
-
-            mcp_tools.search("dividend", limit=50)
-
-            call_args = mock_client.get.call_args
-            assert call_args[1]["params"]["limit"] == 50
+        assert client.calls[-1][1][kw] == val
 
 
 class TestGetClient:
     """Test the _get_client helper."""
 
-    def test_get_client_creates_client_from_config(self, mock_config):
+    def test_get_client_creates_client_from_config(self, monkeypatch):
         """Test _get_client creates client using config."""
-        with patch('src.tools.mcp_tools.create_client_from_config') as mock_create:
-            mock_client = MagicMock()
-            mock_create.return_value = mock_client
+        mock_client = object()
+        mock_create = Mock(return_value=mock_client)
+        monkeypatch.setattr(mcp_tools, 'create_client_from_config', mock_create)
 
-            result = mcp_tools._get_client()
+        result = mcp_tools._get_client()
 
-            mock_create.assert_called_once()
+        mock_create.assert_called_once()
+        assert result is mock_client
 
-    def test_get_client_passes_context(self, mock_config):
+    def test_get_client_passes_context(self, monkeypatch):
         """Test _get_client passes context to factory."""
-        mock_ctx = MagicMock()
-
-        with patch('src.tools.mcp_tools.create_client_from_config') as mock_create:
-            mock_client = MagicMock()
-            mock_create.return_value = mock_client
-
-            mcp_tools._get_client(mock_ctx)
-
-            mock_create.assert_called_once()
-            # Context should be passed as second argument
-            assert mock_create.call_args[0][1] == mock_ctx
-
-
-class TestToolErrorHandling:
-    """Test error handling in tools."""
-
-    def test_pulse_propagates_api_error(self, mock_config):
-        """Test pulse propagates API errors correctly."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.side_effect = ProfitelligenceAPIError(
-                message="Server error",
-                status_code=500
-            )
-            mock_get_client.return_value = mock_client
-
-            with pytest.raises(ProfitelligenceAPIError) as exc_info:
-                mcp_tools.pulse()
-
-            assert exc_info.value.status_code == 500
-            assert "Server error" in exc_info.value.message
-
-    def test_investigate_propagates_404_error(self, mock_config):
-        """Test investigate propagates 404 when symbol not found."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.side_effect = ProfitelligenceAPIError(
-                message="Symbol not found",
-                status_code=404
-            )
-            mock_get_client.return_value = mock_client
-
-            with pytest.raises(ProfitelligenceAPIError) as exc_info:
-                mcp_tools.investigate("INVALID")
-
-            assert exc_info.value.status_code == 404
+        mock_ctx = object()
+        mock_create = Mock(return_value=object())
+        monkeypatch.setattr(mcp_tools, 'create_client_from_config', mock_create)
 
-    def test_screen_propagates_auth_error(self, mock_config):
-        """Test screen propagates 401 authentication errors."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.side_effect = ProfitelligenceAPIError(
-                message="Unauthorized - Invalid API key",
-                status_code=401
-            )
-            mock_get_client.return_value = mock_client
-
-            with pytest.raises(ProfitelligenceAPIError) as exc_info:
-                mcp_tools.screen()
+        mcp_tools._get_client(mock_ctx)
 
-            assert exc_info.value.status_code == 401
+        mock_create.assert_called_once()
+        # Context should be passed as second argument
+        assert mock_create.call_args[0][1] is mock_ctx
 
-    def test_assess_propagates_rate_limit_error(self, mock_config):
-        """Test assess propagates 429 rate limit errors."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.side_effect = ProfitelligenceAPIError(
-                message="Rate limit exceeded",
-                status_code=429
-            )
-            mock_get_client.return_value = mock_client
+    def test_get_client_reuses_connection_pool(self, empty_pool, auth_stub):
+        """Test per-request clients share one pooled httpx client."""
+        auth_stub(headers={"x-api-key": "pk_test_pool"})
 
-            with pytest.raises(ProfitelligenceAPIError) as exc_info:
-                mcp_tools.assess("AAPL")
+        first = mcp_tools._get_client()
+        second = mcp_tools._get_client()
 
-            assert exc_info.value.status_code == 429
-
-    def test_institutional_propagates_network_error(self, mock_config):
-        """Test institutional handles network errors."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.side_effect = ProfitelligenceAPIError(
-                message="HTTP error: Connection refused"
-            )
-            mock_get_client.return_value = mock_client
+        assert first is not second
+        assert first.client is second.client
 
-            with pytest.raises(ProfitelligenceAPIError) as exc_info:
-                mcp_tools.institutional("manager", identifier="Test")
 
-            assert "Connection refused" in exc_info.value.message
-
-    def test_search_propagates_bad_request_error(self, mock_config):
-        """Test search propagates 400 bad request errors."""
-        with patch.object(mcp_tools, '_get_client') as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.side_effect = ProfitelligenceAPIError(
-                message="Bad request - query too short",
-                status_code=400
-            )
-            mock_get_client.return_value = mock_client
-
-            with pytest.raises(ProfitelligenceAPIError) as exc_info:
-                mcp_tools.search("x")  # Too short
+class TestToolErrorHandling:
+    """Test error handling in tools."""
 
-            assert exc_info.value.status_code == 400
+    @pytest.mark.parametrize("call,status,message", [
+        (lambda: mcp_tools.pulse(), 500, "Server error"),
+        (lambda: mcp_tools.investigate("INVALID"), 404, "Symbol not found"),
+        (lambda: mcp_tools.screen(), 401, "Unauthorized - Invalid API key"),
+        (lambda: mcp_tools.assess("AAPL"), 429, "Rate limit exceeded"),
+        (lambda: mcp_tools.institutional("manager", identifier="Test"), None, "HTTP error: Connection refused"),
+        (lambda: mcp_tools.search("x"), 400, "Bad request - query too short"),
+    ], ids=["pulse-500", "investigate-404", "screen-401", "assess-429", "institutional-network", "search-400"])
+    def test_tool_propagates_api_error(self, patched_client, call, status, message):
+        """Test each tool propagates API errors unchanged."""
+        client, _ = patched_client
+        client.error = ProfitelligenceAPIError(
+            message=message,
+            status_code=status
+        )
+
+        with pytest.raises(ProfitelligenceAPIError) as exc_info:
+            call()
+
+        assert exc_info.value.status_code == status
+        assert message in exc_info.value.message
+
+
+@pytest.fixture(scope="class")
+def integration_env(base_url):
+    """Switch the environment to the integration API key once per test class.
+
+    The autouse clear_cached_config fixture reloads config from it before each test.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("PROF_AUTH_METHOD", "api_key")
+        mp.setenv("PROF_API_KEY", "pk_test_integration")
+        mp.setenv("PROF_API_BASE_URL", base_url)
+        yield
 
 
+@pytest.mark.usefixtures("integration_env")
 class TestToolsIntegration:
     """Integration tests that mock at HTTP level.
 
@@ -446,70 +292,73 @@ class TestToolsIntegration:
     """
 
     @pytest.fixture(autouse=True)
-    def setup_integration_env(self, monkeypatch, base_url, mock_http_request):
-        """Set up integration test environment."""
-        import src.utils.config as config_module
-        config_module.config = None
-
-        monkeypatch.setenv("PROF_AUTH_METHOD", "api_key")
-        monkeypatch.setenv("PROF_API_KEY", "pk_test_integration")
-        monkeypatch.setenv("PROF_API_BASE_URL", base_url)
-
-        # Store for use in tests
-        self.base_url = base_url
-        self.mock_request = mock_http_request(headers={"x-api-key": "pk_test_integration"})
+    def setup_integration_env(self, auth_stub):
+        """Make auth see an incoming request carrying the integration API key."""
+        auth_stub(headers={"x-api-key": "pk_test_integration"})
+
+    @pytest.fixture
+    def http_routes(self, monkeypatch, empty_pool):
+        """Serve canned responses through an httpx MockTransport.
+
+        Returns (routes, requests): map a URL path to an httpx.Response in
+        routes; every request the API client sends is appended to requests.
+        """
+        routes = {}
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return routes[request.url.path]
+
+        transport = httpx.MockTransport(handler)
+        # empty_pool makes the tools' pooled client get built on the mock transport
+        monkeypatch.setattr(
+            api_client, "_new_httpx_client",
+            lambda base_url, headers=None: httpx.Client(
+                base_url=base_url, headers=headers, transport=transport
+            )
+        )
+        return routes, requests
 
-    def test_pulse_integration_with_http_mock(self, pulse_response):
+    def test_pulse_integration_with_http_mock(self, http_routes, pulse_response):
         """Integration test - exercises full path through API client."""
-        with respx.mock(base_url=self.base_url) as mock:
-            mock.get("/v1/mcp-pulse").mock(
-                return_value=httpx.Response(200, json=pulse_response)
-            )
+        routes, requests = http_routes
+        routes["/v1/mcp-pulse"] = httpx.Response(200, json=pulse_response)
 
-            with patch('src.utils.auth._get_http_request', return_value=self.mock_request):
-                result = mcp_tools.pulse(ctx=None)
+        result = mcp_tools.pulse(ctx=None)
 
-            assert result == pulse_response
-            assert mock.calls.called
+        assert result == pulse_response
+        assert len(requests) == 1
+        assert requests[0].headers["authorization"] == "ApiKey pk_test_integration"
 
-    def test_investigate_integration_with_http_mock(self, investigate_response):
+    def test_investigate_integration_with_http_mock(self, http_routes, investigate_response):
         """Integration test for investigate tool."""
-        with respx.mock(base_url=self.base_url) as mock:
-            mock.get("/v1/mcp-investigate").mock(
-                return_value=httpx.Response(200, json=investigate_response)
-            )
+        routes, requests = http_routes
+        routes["/v1/mcp-investigate"] = httpx.Response(200, json=investigate_response)
 
-            with patch('src.utils.auth._get_http_request', return_value=self.mock_request):
-                result = mcp_tools.investigate("AAPL", days=30)
+        result = mcp_tools.investigate("AAPL", days=30)
 
-            assert result == investigate_response
-            # Verify query params were passed
-            assert "subject=AAPL" in str(mock.calls.last.request.url)
+        assert result == investigate_response
+        assert last_params(requests) == {"subject": "AAPL", "days": "30"}
 
-    def test_screen_integration_with_sector_filter(self, screen_response):
+    def test_screen_integration_with_sector_filter(self, http_routes, screen_response):
         """Integration test for screen tool with filters."""
-        with respx.mock(base_url=self.base_url) as mock:
-            mock.get("/v1/mcp-screen").mock(
-                return_value=httpx.Response(200, json=screen_response)
-            )
+        routes, requests = http_routes
+        routes["/v1/mcp-screen"] = httpx.Response(200, json=screen_response)
 
-            with patch('src.utils.auth._get_http_request', return_value=self.mock_request):
-                result = mcp_tools.screen(focus="insider", sector="Technology")
+        result = mcp_tools.screen(focus="insider", sector="Technology")
 
-            assert result == screen_response
-            request_url = str(mock.calls.last.request.url)
-            assert "focus=insider" in request_url
-            assert "sector=Technology" in request_url
+        assert result == screen_response
+        params = last_params(requests)
+        assert params["focus"] == "insider"
+        assert params["sector"] == "Technology"
 
-    def test_integration_handles_http_error(self):
+    def test_integration_handles_http_error(self, http_routes):
         """Integration test verifies HTTP errors propagate correctly."""
-        with respx.mock(base_url=self.base_url) as mock:
-            mock.get("/v1/mcp-pulse").mock(
-                return_value=httpx.Response(500, json={"error": "Internal server error"})
-            )
+        routes, _ = http_routes
+        routes["/v1/mcp-pulse"] = httpx.Response(500, json={"error": "Internal server error"})
 
-            with patch('src.utils.auth._get_http_request', return_value=self.mock_request):
-                with pytest.raises(ProfitelligenceAPIError) as exc_info:
-                    mcp_tools.pulse(ctx=None)
+        with pytest.raises(ProfitelligenceAPIError) as exc_info:
+            mcp_tools.pulse(ctx=None)
 
-            assert exc_info.value.status_code == 500
+        assert exc_info.value.status_code == 500